@@ -1,3 +1,4 @@
+import os
 from typing import Any, Dict
 from google.adk.agents import Agent
 
@@ -11,28 +12,14 @@ from tools.profiles import (
 from tools.funding import get_company_funding_summary
 from tools.traffic import get_web_traffic_summary
 from tools.financials import detect_ticker, get_public_financials
+from tools.context import bind_research_context
+from tools.prefetch import prefetch_before_model
+from tools.report_cache import serve_cached_report, store_final_report
 
+# Pipeline mode: prefetch every tool in parallel, then one synthesis turn without tool calls
+PIPELINE_MODE = os.environ.get("RESEARCH_PIPELINE", "0").lower() in ("1", "true", "yes")
 
-root_agent = Agent(
-    name="agent",
-    model="gemini-2.0-flash",
-    description="Company research agent that returns JSON-only structured reports from open-web sources.",
-    instruction=
-    """
-    You are a company research agent. Always output a single JSON object only, no prose, no Markdown.
-
-    Input: company name string, optionally a country for disambiguation.
-
-    Process:
-    - Detect the official website and a possible public stock ticker via detect_ticker.
-    - Build an overview via get_company_overview.
-    - Gather founders/leadership via get_company_leadership.
-    - Identify key competitors via get_company_competitors.
-    - Summarize funding from public sources via get_company_funding_summary.
-    - Summarize web traffic signals via get_web_traffic_summary (approximate; cite sources).
-    - Collect recent news via news_search.
-    - If a ticker is found, optionally enrich with get_public_financials.
-
+OUTPUT_SPEC = """
     Output schema (strict):
     {
       "company": {
@@ -81,20 +68,72 @@ root_agent = Agent(
     - JSON only. No additional text.
     - Include per-section sources arrays, deduplicated.
     - If data is uncertain or not found, set fields to null or leave arrays empty.
-    """,
-    tools=[
-        # Discovery
-        web_search,
-        fetch_url,
-        news_search,
-        detect_ticker,
-        # Profiles
-        get_company_overview,
-        get_company_leadership,
-        get_company_competitors,
-        # Funding / traffic / financials
-        get_company_funding_summary,
-        get_web_traffic_summary,
-        get_public_financials,
-    ],
-)
\ No newline at end of file
+"""
+
+TOOL_INSTRUCTION = """
+    You are a company research agent. Always output a single JSON object only, no prose, no Markdown.
+
+    Input: company name string, optionally a country for disambiguation.
+
+    Process:
+    - Detect the official website and a possible public stock ticker via detect_ticker.
+    - Build an overview via get_company_overview.
+    - Gather founders/leadership via get_company_leadership.
+    - Identify key competitors via get_company_competitors.
+    - Summarize funding from public sources via get_company_funding_summary.
+    - Summarize web traffic signals via get_web_traffic_summary (approximate; cite sources).
+    - Collect recent news via news_search.
+    - If a ticker is found, optionally enrich with get_public_financials.
+""" + OUTPUT_SPEC
+
+PIPELINE_INSTRUCTION = """
+    You are a company research agent. Always output a single JSON object only, no prose, no Markdown.
+
+    Input: company name string, optionally a country for disambiguation, followed by
+    "Research data": the JSON outputs of every research tool (ticker and financials,
+    overview, leadership, competitors, funding, web_traffic, news), already collected.
+
+    Process:
+    - Build the report from the research data only; do not invent facts or sources.
+    - Take sources from the URLs in the research data.
+""" + OUTPUT_SPEC
+
+
+if PIPELINE_MODE:
+    root_agent = Agent(
+        name="agent",
+        model="gemini-2.0-flash",
+        description="Company research agent that returns JSON-only structured reports from open-web sources.",
+        instruction=PIPELINE_INSTRUCTION,
+        # Cached reports skip the prefetch; otherwise all research runs
+        # concurrently before the (single) model call
+        before_model_callback=[serve_cached_report, prefetch_before_model],
+        after_model_callback=store_final_report,
+    )
+else:
+    root_agent = Agent(
+        name="agent",
+        model="gemini-2.0-flash",
+        description="Company research agent that returns JSON-only structured reports from open-web sources.",
+        instruction=TOOL_INSTRUCTION,
+        tools=[
+            # Discovery
+            web_search,
+            fetch_url,
+            news_search,
+            detect_ticker,
+            # Profiles
+            get_company_overview,
+            get_company_leadership,
+            get_company_competitors,
+            # Funding / traffic / financials
+            get_company_funding_summary,
+            get_web_traffic_summary,
+            get_public_financials,
+        ],
+        # Share one research context (memoized lookups and pages) per invocation
+        before_tool_callback=bind_research_context,
+        # Answer from / fill the whole-report cache
+        before_model_callback=serve_cached_report,
+        after_model_callback=store_final_report,
+    )
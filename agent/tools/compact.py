@@ -0,0 +1,114 @@
+"""Compact tool outputs: rank snippets, drop near-duplicates, fit a char budget.
+
+Syndicated articles and mirrored pages repeat the same sentences, and every
+snippet a tool returns is read by the model on each turn. In compact mode
+(TOOL_OUTPUT_COMPACT=1, off by default) tools pass their snippet lists through
+`compact_items`. It ranks the snippets by how many of the tool's signal terms
+they contain, drops any snippet that is a fragment of one already kept or whose
+64-bit simhash is within SIMHASH_DISTANCE bits of one, and keeps the best ones
+that fit the tool's budget (TOOL_BUDGET_<TOOL> chars, roughly 4 chars per token).
+"""
+
+import hashlib
+import os
+import re
+from typing import Any, Dict, Iterable, List, Sequence
+
+ENABLED = os.environ.get("TOOL_OUTPUT_COMPACT", "0").lower() in ("1", "true", "yes")
+# Max differing simhash bits for two snippets to count as the same text
+SIMHASH_DISTANCE = int(os.environ.get("SIMHASH_DISTANCE", "6"))
+
+# Default char budgets per tool output; override with TOOL_BUDGET_<NAME>
+_DEFAULT_BUDGETS = {
+    "funding": 3000,
+    "leadership": 1500,
+    "traffic": 1500,
+}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_NUMBER_RE = re.compile(r"\d")
+
+
+def budget(tool: str) -> int:
+    """Char budget for `tool` (e.g. "funding"), from TOOL_BUDGET_FUNDING or the default."""
+    return int(os.environ.get(f"TOOL_BUDGET_{tool.upper()}", str(_DEFAULT_BUDGETS.get(tool, 2000))))
+
+
+def simhash(text: str) -> int:
+    """64-bit simhash over word 3-shingles (single words for very short text)."""
+    words = _WORD_RE.findall(text.lower())
+    shingles = [" ".join(words[i : i + 3]) for i in range(max(1, len(words) - 2))] if len(words) >= 3 else words
+    weights = [0] * 64
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def score(text: str, terms: Sequence[str]) -> float:
+    """Informativeness: distinct signal terms present, plus a bonus for figures."""
+    lowered = text.lower()
+    hits = sum(1 for term in terms if term.lower() in lowered)
+    return hits + (0.5 if _NUMBER_RE.search(text) else 0.0)
+
+
+def trim(text: str, limit: int) -> str:
+    """Cut `text` to at most `limit` chars, at a word boundary when one is near."""
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[: cut if cut > limit * 0.6 else limit].rstrip(" ,;:-") + "…"
+
+
+def compact_items(
+    items: Iterable[Dict[str, Any]],
+    budget_chars: int,
+    terms: Sequence[str] = (),
+    key: str = "text",
+    item_chars: int = 0,
+) -> List[Dict[str, Any]]:
+    """Best-ranked, de-duplicated items whose `key` texts fit in `budget_chars`.
+
+    Ties keep the original order. `item_chars` (if set) trims each text first.
+    Output is in rank order. Returns the items unchanged when compact mode is off.
+    """
+    items = list(items)
+    if not ENABLED:
+        return items
+    ranked = sorted(enumerate(items), key=lambda pair: (-score(pair[1].get(key) or "", terms), pair[0]))
+    kept: List[Dict[str, Any]] = []
+    hashes: List[int] = []
+    kept_lower: List[str] = []
+    used = 0
+    for _, item in ranked:
+        text = " ".join((item.get(key) or "").split())
+        if item_chars:
+            text = trim(text, item_chars)
+        if not text:
+            continue
+        h = simhash(text)
+        lowered = text.lower()
+        # Near-duplicate of a kept snippet, or a fragment of one
+        if any(hamming(h, other) <= SIMHASH_DISTANCE for other in hashes) or any(lowered in k for k in kept_lower):
+            continue
+        if used + len(text) > budget_chars:
+            if used:
+                continue
+            # Always return something: the best item, cut to the budget
+            text = trim(text, budget_chars)
+        hashes.append(h)
+        kept_lower.append(lowered)
+        used += len(text)
+        kept.append({**item, key: text})
+    return kept
+
+
+def compact_texts(texts: Iterable[str], budget_chars: int, terms: Sequence[str] = (), item_chars: int = 0) -> List[str]:
+    """`compact_items` for plain strings."""
+    return [i["text"] for i in compact_items(({"text": t} for t in texts), budget_chars, terms, item_chars=item_chars)]
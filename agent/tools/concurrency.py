@@ -0,0 +1,33 @@
+"""Bounded thread-pool fan-out used by the research tools.
+
+Searches and page fetches are network-bound, so threads are enough to overlap
+them. Results always come back in input order so tool output stays deterministic,
+and each job runs in a copy of the caller's contextvars (research context etc.).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Parallelism cap per fan-out (searches or page fetches issued by one tool step)
+MAX_PARALLEL = int(os.environ.get("RESEARCH_MAX_PARALLEL", "8"))
+
+
+def parallel_map(fn: Callable[[T], R], items: Iterable[T], max_workers: Optional[int] = None) -> List[R]:
+    """Apply `fn` to every item concurrently and return results in input order."""
+    items = list(items)
+    workers = min(max_workers or MAX_PARALLEL, len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="research") as pool:
+        futures = [pool.submit(copy_context().run, fn, item) for item in items]
+        return [f.result() for f in futures]
+
+
+def run_parallel(*fns: Callable[[], Any], max_workers: Optional[int] = None) -> List[Any]:
+    """Run zero-argument callables concurrently and return their results in order."""
+    return parallel_map(lambda fn: fn(), fns, max_workers=max_workers)
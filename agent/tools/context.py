@@ -0,0 +1,118 @@
+"""Per-report research context.
+
+One agent run calls several tools that need the same facts (official website,
+Wikipedia article, social profiles, ticker) and the same pages. The context bound
+to the current ADK invocation memoizes those lookups so each is computed once per
+report, even when tools run concurrently.
+"""
+
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from . import deadline
+
+# Contexts kept alive for in-flight invocations; old ones are dropped first
+MAX_CONTEXTS = 64
+
+
+class ResearchContext:
+    """Memo table shared by every tool call of one report."""
+
+    def __init__(self, key: str, pinned: bool = False, max_entries: Optional[int] = None):
+        self.key = key
+        # A pinned context (e.g. one shared by a whole batch) is kept across invocations
+        self.pinned = pinned
+        # Long-lived contexts cap their memo table; least recently used values go first
+        self.max_entries = max_entries
+        # Report deadline (see tools.deadline), fixed when the first tool call binds it
+        self.deadline: Optional[float] = None
+        self._values: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def memoize(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return the value for `key`, computing it with `fn` at most once.
+
+        Concurrent callers for the same key wait for the first computation.
+        Tool error payloads are not memoized so a later call can retry.
+        """
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return self._values[key]
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._values:
+                    return self._values[key]
+            value = fn()
+            with self._lock:
+                # Callers already waiting hold the lock; new ones find the value
+                self._locks.pop(key, None)
+                if not (isinstance(value, dict) and value.get("status") == "error"):
+                    self._values[key] = value
+                    while self.max_entries is not None and len(self._values) > self.max_entries:
+                        self._values.popitem(last=False)
+            return value
+
+
+_current: ContextVar[Optional[ResearchContext]] = ContextVar("research_context", default=None)
+_registry: "OrderedDict[str, ResearchContext]" = OrderedDict()
+_registry_lock = threading.Lock()
+
+
+def bind_context(key: str) -> ResearchContext:
+    """Bind (creating if needed) the context for `key` to the current execution context."""
+    with _registry_lock:
+        ctx = _registry.get(key)
+        if ctx is None:
+            ctx = _registry[key] = ResearchContext(key)
+            while len(_registry) > MAX_CONTEXTS:
+                _registry.popitem(last=False)
+        else:
+            _registry.move_to_end(key)
+    _current.set(ctx)
+    return ctx
+
+
+def use_context(ctx: ResearchContext) -> None:
+    """Bind an explicitly created context, e.g. one shared by every report in a batch."""
+    _current.set(ctx)
+
+
+def current_context() -> Optional[ResearchContext]:
+    return _current.get()
+
+
+def memoize(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """Memoize `fn` in the bound research context; just call it when none is bound."""
+    ctx = _current.get()
+    if ctx is None:
+        return fn()
+    return ctx.memoize(key, fn)
+
+
+def bind_invocation(invocation_id: str) -> ResearchContext:
+    """Bind the context of an ADK invocation, unless a pinned (batch) context is active.
+
+    The invocation's report deadline starts with its first bound call; a pinned
+    context's owner binds deadlines itself.
+    """
+    ctx = _current.get()
+    if ctx is not None and ctx.pinned:
+        return ctx
+    ctx = bind_context(invocation_id)
+    with ctx._lock:
+        if ctx.deadline is None:
+            ctx.deadline = deadline.start()
+        else:
+            deadline.bind(ctx.deadline)
+    return ctx
+
+
+def bind_research_context(tool: Any, args: Dict[str, Any], tool_context: Any) -> Optional[Dict[str, Any]]:
+    """ADK before_tool_callback: share one research context per invocation."""
+    bind_invocation(tool_context.invocation_id)
+    return None
@@ -0,0 +1,137 @@
+"""Pool of long-lived DuckDuckGo search clients.
+
+Building a `DDGS` client sets up a new HTTP session (TLS, cookies, browser
+impersonation), so one is leased from this pool per search instead of built
+per search. A client is used by one thread at a time. It is recycled after
+DDGS_POOL_MAX_USES searches, after DDGS_POOL_MAX_AGE seconds, or when it has
+sat idle longer than DDGS_POOL_IDLE_TIMEOUT (its connections are likely
+dead). It is also recycled as soon as a search on it fails with a transport or
+throttling error, since a fresh client gets a fresh session and fingerprint.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from duckduckgo_search import DDGS
+from duckduckgo_search.exceptions import DuckDuckGoSearchException
+
+SIZE = int(os.environ.get("DDGS_POOL_SIZE", "8"))
+MAX_USES = int(os.environ.get("DDGS_POOL_MAX_USES", "200"))
+MAX_AGE = float(os.environ.get("DDGS_POOL_MAX_AGE", "600"))
+IDLE_TIMEOUT = float(os.environ.get("DDGS_POOL_IDLE_TIMEOUT", "60"))
+# Longest a search waits for a free client
+ACQUIRE_TIMEOUT = float(os.environ.get("DDGS_POOL_ACQUIRE_TIMEOUT", "30"))
+
+
+class _Pooled:
+    __slots__ = ("client", "created_at", "last_used", "uses")
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.created_at = self.last_used = time.monotonic()
+        self.uses = 0
+
+
+class DdgsPool:
+    """Thread-safe pool of search clients built by `factory`."""
+
+    def __init__(self, factory: Callable[[], Any], size: int = SIZE):
+        self.factory = factory
+        self.size = max(1, size)
+        self._idle: List[_Pooled] = []
+        self._leased = 0
+        self._cond = threading.Condition()
+        self._stats = {"created": 0, "recycled": 0, "leases": 0, "waits": 0}
+
+    def _healthy(self, item: _Pooled, now: float) -> bool:
+        return item.uses < MAX_USES and now - item.created_at < MAX_AGE and now - item.last_used < IDLE_TIMEOUT
+
+    def _checkout(self) -> _Pooled:
+        with self._cond:
+            deadline = time.monotonic() + ACQUIRE_TIMEOUT
+            while True:
+                now = time.monotonic()
+                while self._idle:
+                    # Most recently used first: its connections are the warmest
+                    item = self._idle.pop()
+                    if self._healthy(item, now):
+                        self._leased += 1
+                        self._stats["leases"] += 1
+                        return item
+                    self._stats["recycled"] += 1
+                if self._leased < self.size:
+                    self._leased += 1
+                    self._stats["leases"] += 1
+                    self._stats["created"] += 1
+                    break
+                self._stats["waits"] += 1
+                if now >= deadline or not self._cond.wait(deadline - now):
+                    raise TimeoutError("no search client became free in time")
+        try:
+            # Built outside the lock; client construction does I/O setup
+            return _Pooled(self.factory())
+        except BaseException:
+            with self._cond:
+                self._leased -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, item: _Pooled, broken: bool) -> None:
+        item.uses += 1
+        item.last_used = time.monotonic()
+        # Pacing is done per upstream (see resilience.py); drop DDGS's own
+        # per-client delay between consecutive searches on a reused client.
+        if hasattr(item.client, "sleep_timestamp"):
+            item.client.sleep_timestamp = 0.0
+        with self._cond:
+            self._leased -= 1
+            if broken or not self._healthy(item, item.last_used):
+                self._stats["recycled"] += 1
+            else:
+                self._idle.append(item)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """Borrow a client for one search."""
+        item = self._checkout()
+        broken = False
+        try:
+            yield item.client
+        except (DuckDuckGoSearchException, OSError):
+            broken = True
+            raise
+        finally:
+            self._checkin(item, broken)
+
+    def clear(self) -> None:
+        """Drop every idle client; leased ones are dropped when returned unhealthy or aged out."""
+        with self._cond:
+            self._stats["recycled"] += len(self._idle)
+            self._idle.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {**self._stats, "idle": len(self._idle), "leased": self._leased, "size": self.size}
+
+
+_pool = DdgsPool(DDGS)
+
+
+def lease() -> Any:
+    """Borrow a client from the shared pool: `with ddgs_pool.lease() as ddgs: ...`."""
+    return _pool.lease()
+
+
+def set_factory(factory: Optional[Callable[[], Any]]) -> None:
+    """Build clients with `factory` from now on (e.g. a fake for benchmarks); None restores DDGS."""
+    _pool.factory = factory or DDGS
+    _pool.clear()
+
+
+def stats() -> Dict[str, int]:
+    """Lease/creation/recycle counters and current occupancy of the shared pool."""
+    return _pool.stats()
@@ -0,0 +1,67 @@
+"""Overall time budget for one report.
+
+A deadline (a time.monotonic() instant) is bound to the current execution
+context when a report starts. Like the research context, it follows tool
+calls into worker threads. Tools consult it before starting network work:
+once less than DEADLINE_RESERVE seconds are left they stop issuing searches
+and fetches and return what they already have. Timeouts and retry waits are
+also clamped to the remaining budget. With no deadline bound (REPORT_DEADLINE=0,
+scripts, benchmarks) nothing changes.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from . import metrics
+
+# Seconds one report may spend on research; 0 disables the budget
+REPORT_DEADLINE = float(os.environ.get("REPORT_DEADLINE", "90"))
+# Budget kept back for shaping results (and the model turn) once research stops
+RESERVE = float(os.environ.get("DEADLINE_RESERVE", "3"))
+
+_deadline: ContextVar[Optional[float]] = ContextVar("report_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised instead of starting work that cannot finish within the report deadline."""
+
+
+def start(seconds: float = REPORT_DEADLINE) -> Optional[float]:
+    """Bind a deadline `seconds` from now (none when `seconds` <= 0) and return it."""
+    at = time.monotonic() + seconds if seconds > 0 else None
+    _deadline.set(at)
+    return at
+
+
+def bind(at: Optional[float]) -> None:
+    """Bind an existing deadline, e.g. the one of the invocation a tool call belongs to."""
+    _deadline.set(at)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the bound deadline, or None without one."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def exhausted() -> bool:
+    """True when too little budget is left to start more network work."""
+    left = remaining()
+    return left is not None and left < RESERVE
+
+
+def clamp(seconds: float) -> float:
+    """`seconds`, shortened to what is left of the budget before the reserve (at least 0.1s)."""
+    left = remaining()
+    if left is None:
+        return seconds
+    return max(0.1, min(seconds, left - RESERVE))
+
+
+def check(kind: str) -> None:
+    """Raise DeadlineExceeded if the budget is exhausted; `kind` ("search", "fetch") names the skipped work."""
+    if exhausted():
+        metrics.inc("research_deadline_skips_total", {"kind": kind})
+        raise DeadlineExceeded(f"report deadline reached, {kind} skipped")
@@ -0,0 +1,111 @@
+"""Resolvers for stable per-company facts shared across tools.
+
+Website, Wikipedia article and social profile URLs are looked up by several
+tools; each resolver is memoized in the bound research context so one report
+resolves each fact once, and backed by the persistent entity store so later
+reports don't search again until the fact is due for re-checking.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import entity_store
+from .context import memoize
+from .metrics import instrument
+from .search import web_search
+
+
+def _result_url(results: List[Dict[str, Any]]) -> Optional[str]:
+    for r in results:
+        href = r.get("href") or r.get("url")
+        if href:
+            return href
+    return None
+
+
+def _fact_key(fact: str, company: str, country: str = "") -> tuple:
+    return (fact, company.strip().lower(), country.strip().lower())
+
+
+def _first_href(query: str, max_results: int, match) -> Optional[Tuple[Optional[str], List[str]]]:
+    """(first matching href or None, [it]); None when the search failed."""
+    res = web_search(query, max_results=max_results)
+    if res.get("status") != "success":
+        return None
+    for r in res.get("data", []):
+        href = r.get("href") or ""
+        if match(href):
+            return href, [href]
+    return None, []
+
+
+def _stored_href(fact: str, company: str, country: str, query: str, max_results: int, match) -> Optional[str]:
+    entry = entity_store.resolve(fact, company, country, lambda: _first_href(query, max_results, match))
+    return entry["value"] if entry else None
+
+
+@instrument
+def detect_official_website(company: str, country: str = "") -> Dict[str, Any]:
+    """Attempt to detect the official website of a company using web search."""
+
+    failed: List[Dict[str, Any]] = []
+
+    def search() -> Optional[Tuple[Optional[str], List[str]]]:
+        query = f"{company} official website"
+        if country:
+            query += f" {country}"
+        res = web_search(query, max_results=5)
+        if res.get("status") != "success":
+            failed.append(res)
+            return None
+        url = _result_url(res["data"]) if res.get("data") else None
+        return url, [r.get("href") for r in res.get("data", []) if r.get("href")]
+
+    def resolve() -> Dict[str, Any]:
+        entry = entity_store.resolve("website", company, country, search)
+        if entry is None:
+            return failed[0]
+        return {
+            "status": "success",
+            "data": {
+                "website": entry["value"],
+                "sources": entry["sources"],
+                "confidence": entry["confidence"],
+                "last_verified": entry["verified_at"],
+            },
+        }
+
+    return memoize(_fact_key("website", company, country), resolve)
+
+
+@instrument
+def find_wikipedia_url(company: str, country: str = "") -> Optional[str]:
+    """Best-effort Wikipedia article URL for the company."""
+    query = f"{company} wikipedia"
+    if country:
+        query += f" {country}"
+    return memoize(
+        _fact_key("wikipedia", company, country),
+        lambda: _stored_href("wikipedia", company, country, query, 3, lambda href: "wikipedia.org" in href),
+    )
+
+
+@instrument
+def find_linkedin_url(company: str) -> Optional[str]:
+    """Best-effort LinkedIn company page URL."""
+    return memoize(
+        _fact_key("linkedin", company),
+        lambda: _stored_href(
+            "linkedin", company, "", f"{company} LinkedIn company page", 3, lambda href: "linkedin.com/company" in href
+        ),
+    )
+
+
+@instrument
+def find_twitter_url(company: str) -> Optional[str]:
+    """Best-effort Twitter/X profile URL."""
+    return memoize(
+        _fact_key("twitter", company),
+        lambda: _stored_href(
+            "twitter", company, "", f"{company} Twitter official", 3, lambda href: "twitter.com" in href or "x.com" in href
+        ),
+    )
@@ -0,0 +1,151 @@
+"""Persistent store of resolved company facts (website, Wikipedia, LinkedIn, X).
+
+These links rarely change, so a fact resolved once is kept in SQLite under
+(company, country, fact), names normalized as in the ticker index ("Acme Inc."
+and "acme" share entries), with a confidence score and the time it
+was last verified. Later reports read it without searching. A fact checked
+more than ENTITY_STORE_TTL (30d) ago is re-resolved on its next use; if that
+finds nothing the stored value is kept and checked again after
+ENTITY_STORE_NEGATIVE_TTL (1d), which is also how long "not found" is
+remembered. Failed searches are never stored.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .ticker_index import normalize_name
+from .store import connect
+
+ENABLED = os.environ.get("ENTITY_STORE", "1").lower() in ("1", "true", "yes")
+TTL = int(os.environ.get("ENTITY_STORE_TTL", str(30 * 24 * 3600)))
+NEGATIVE_TTL = int(os.environ.get("ENTITY_STORE_NEGATIVE_TTL", str(24 * 3600)))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    company TEXT NOT NULL,
+    country TEXT NOT NULL,
+    fact TEXT NOT NULL,
+    value TEXT,
+    confidence REAL NOT NULL,
+    sources TEXT NOT NULL,
+    verified_at REAL NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (company, country, fact)
+);
+"""
+
+# A resolver returns (value, sources), value None meaning not found, or None
+# when the lookup itself failed
+Resolver = Callable[[], Optional[Tuple[Optional[str], List[str]]]]
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "refreshed": 0, "kept": 0}
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def stats() -> Dict[str, int]:
+    """Hit/miss counters since process start; `kept` counts stale facts kept after a failed re-check."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def confidence(company: str, url: Optional[str]) -> float:
+    """0.9 when the URL's host or path contains a word of the company name, else 0.5 (0 for no URL)."""
+    if not url:
+        return 0.0
+    parts = urlsplit(url)
+    haystack = re.sub(r"[^a-z0-9]", "", f"{parts.hostname or ''}{parts.path}".lower())
+    words = [w for w in re.findall(r"[a-z0-9]+", company.lower()) if len(w) >= 3]
+    joined = "".join(re.findall(r"[a-z0-9]+", company.lower()))
+    return 0.9 if joined in haystack or any(w in haystack for w in words) else 0.5
+
+
+def _read(key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+    try:
+        row = connect("entities", _SCHEMA).execute(
+            "SELECT value, confidence, sources, verified_at, checked_at FROM facts"
+            " WHERE company = ? AND country = ? AND fact = ?",
+            key,
+        ).fetchone()
+    except (sqlite3.Error, OSError):
+        return None
+    if row is None:
+        return None
+    value, conf, sources, verified_at, checked_at = row
+    return {
+        "value": value,
+        "confidence": conf,
+        "sources": json.loads(sources),
+        "verified_at": verified_at,
+        "checked_at": checked_at,
+    }
+
+
+def _write(key: Tuple[str, str, str], entry: Dict[str, Any]) -> None:
+    try:
+        conn = connect("entities", _SCHEMA)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    *key,
+                    entry["value"],
+                    entry["confidence"],
+                    json.dumps(entry["sources"]),
+                    entry["verified_at"],
+                    entry["checked_at"],
+                ),
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def _entry(company: str, value: Optional[str], sources: List[str]) -> Dict[str, Any]:
+    now = time.time()
+    conf = confidence(company, value)
+    return {"value": value, "confidence": conf, "sources": sources, "verified_at": now, "checked_at": now}
+
+
+def resolve(fact: str, company: str, country: str, resolver: Resolver) -> Optional[Dict[str, Any]]:
+    """Stored fact for the company, re-resolved with `resolver` when missing or stale.
+
+    Returns {"value", "confidence", "sources", "verified_at", "checked_at"}, or
+    None when the resolver failed and nothing is stored.
+    """
+    if not ENABLED:
+        resolved = resolver()
+        return _entry(company, *resolved) if resolved is not None else None
+
+    key = (normalize_name(company), normalize_name(country), fact)
+    stored = _read(key)
+    if stored is not None:
+        ttl = TTL if stored["value"] else NEGATIVE_TTL
+        if time.time() - stored["checked_at"] < ttl:
+            _count("hits")
+            return stored
+
+    _count("misses" if stored is None else "refreshed")
+    resolved = resolver()
+    if resolved is None:
+        # Lookup failed: serve what we have, store nothing
+        return stored
+    value, sources = resolved
+    if value is None and stored is not None and stored["value"]:
+        # The re-check found nothing; the old link is still the best answer.
+        # Keep it, and look again after NEGATIVE_TTL rather than TTL.
+        _count("kept")
+        entry = {**stored, "checked_at": time.time() - TTL + NEGATIVE_TTL}
+    else:
+        entry = _entry(company, value, sources)
+    _write(key, entry)
+    return entry
@@ -0,0 +1,218 @@
+"""Pluggable HTML-to-text extraction.
+
+Every backend produces the same output: the page title, and the visible text
+with script-like tags dropped, each text node on its own line(s) and blank lines
+removed. Backends:
+
+- "lxml" (default): feeds body chunks to lxml's event-driven parser, so fetch_url
+  can stop downloading once `max_chars` of text have been produced.
+- "selectolax": lexbor-based, parses the buffered body in one pass (optional dependency).
+- "bs4": BeautifulSoup, the original implementation; used as the fallback.
+
+Select with the HTML_EXTRACTOR env var.
+"""
+
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from lxml import etree
+
+SKIP_TAGS = frozenset(["script", "style", "noscript", "svg", "canvas"])
+_FEED_SLICE = 64 * 1024
+
+
+class _TextTarget:
+    """lxml parser target accumulating stripped text lines."""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.lines: List[str] = []
+        self.chars = 0
+        self.title: Optional[str] = None
+        self._buf: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    @property
+    def done(self) -> bool:
+        return self.chars >= self.max_chars
+
+    def _flush(self) -> None:
+        if not self._buf:
+            return
+        text = "".join(self._buf)
+        self._buf = []
+        if self._in_title and self.title is None:
+            self.title = text.strip() or None
+        for line in text.splitlines():
+            line = line.strip()
+            if line:
+                self.lines.append(line)
+                self.chars += len(line) + 1
+
+    def start(self, tag, attrib) -> None:
+        self._flush()
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+
+    def end(self, tag) -> None:
+        self._flush()
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == "title":
+            self._in_title = False
+
+    def data(self, data: str) -> None:
+        if not self._skip_depth:
+            self._buf.append(data)
+
+    def close(self) -> None:
+        self._flush()
+
+
+class StreamingHtmlExtractor:
+    """Feed HTML bytes chunk by chunk; check `done` to stop reading early."""
+
+    def __init__(self, max_chars: int, encoding: Optional[str] = None):
+        self.max_chars = max_chars
+        self._target = _TextTarget(max_chars)
+        self._parser = etree.HTMLParser(target=self._target, encoding=encoding)
+
+    @property
+    def done(self) -> bool:
+        return self._target.done
+
+    @property
+    def chars(self) -> int:
+        """Characters of text extracted so far."""
+        return self._target.chars
+
+    def feed(self, chunk: bytes) -> None:
+        if chunk and not self.done:
+            self._parser.feed(chunk)
+
+    def result(self) -> Tuple[Optional[str], str, bool]:
+        """Finish parsing and return (title, text, truncated)."""
+        stopped_early = self.done
+        try:
+            self._parser.close()
+        except etree.LxmlError:
+            # Truncated input can leave the parser in an error state; keep what we have
+            self._target.close()
+        text = "\n".join(self._target.lines)
+        return self._target.title, text[: self.max_chars], stopped_early or len(text) > self.max_chars
+
+
+def _join_lines(raw_text: str) -> str:
+    return "\n".join(line.strip() for line in raw_text.splitlines() if line.strip())
+
+
+class BufferedHtmlExtractor:
+    """Base for backends that parse the whole (byte-capped) body at once."""
+
+    # Never stops early; reading is bounded by fetch_url's byte budget instead
+    done = False
+
+    def __init__(self, max_chars: int, encoding: Optional[str] = None):
+        self.max_chars = max_chars
+        self.encoding = encoding
+        self._chunks: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> None:
+        self._chunks.append(chunk)
+
+    def _extract(self, data: bytes) -> Tuple[Optional[str], str]:
+        raise NotImplementedError
+
+    def result(self) -> Tuple[Optional[str], str, bool]:
+        title, text = self._extract(b"".join(self._chunks))
+        return title, text[: self.max_chars], len(text) > self.max_chars
+
+
+class SoupHtmlExtractor(BufferedHtmlExtractor):
+    def _extract(self, data: bytes) -> Tuple[Optional[str], str]:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(data, "lxml", from_encoding=self.encoding)
+        for tag in soup(list(SKIP_TAGS)):
+            tag.decompose()
+        title = None
+        if soup.title and soup.title.string:
+            title = soup.title.string.strip()
+        return title, _join_lines(soup.get_text(separator="\n"))
+
+
+class LexborHtmlExtractor(BufferedHtmlExtractor):
+    def _extract(self, data: bytes) -> Tuple[Optional[str], str]:
+        from selectolax.lexbor import LexborHTMLParser
+
+        if self.encoding:
+            data = data.decode(self.encoding, errors="replace").encode("utf-8")
+        tree = LexborHTMLParser(data)
+        tree.strip_tags(list(SKIP_TAGS))
+        title = None
+        title_node = tree.css_first("title")
+        if title_node is not None:
+            title = (title_node.text() or "").strip() or None
+        if tree.root is None:
+            return title, ""
+        return title, _join_lines(tree.root.text(separator="\n"))
+
+
+def _module_available(name: str) -> Callable[[], bool]:
+    def check() -> bool:
+        try:
+            __import__(name)
+        except ImportError:
+            return False
+        return True
+
+    return check
+
+
+BACKENDS: Dict[str, type] = {
+    "lxml": StreamingHtmlExtractor,
+    "selectolax": LexborHtmlExtractor,
+    "bs4": SoupHtmlExtractor,
+}
+_AVAILABLE: Dict[str, Callable[[], bool]] = {
+    "lxml": lambda: True,
+    "selectolax": _module_available("selectolax.lexbor"),
+    "bs4": _module_available("bs4"),
+}
+FALLBACK_BACKEND = "bs4"
+
+
+def available_backends() -> List[str]:
+    return [name for name in BACKENDS if _AVAILABLE[name]()]
+
+
+def _resolve_backend(name: str) -> str:
+    return name if name in BACKENDS and _AVAILABLE[name]() else FALLBACK_BACKEND
+
+
+DEFAULT_BACKEND = _resolve_backend(os.environ.get("HTML_EXTRACTOR", "lxml").lower())
+
+
+def new_extractor(max_chars: int, encoding: Optional[str] = None, backend: Optional[str] = None):
+    """Create an extractor exposing feed(chunk), done and result()."""
+    name = _resolve_backend(backend) if backend else DEFAULT_BACKEND
+    return BACKENDS[name](max_chars, encoding)
+
+
+def extract_html(
+    data: bytes, max_chars: int, encoding: Optional[str] = None, backend: Optional[str] = None
+) -> Tuple[Optional[str], str, bool]:
+    """Extract (title, text, truncated) from a complete HTML document.
+
+    Module-level so it can run in the parse process pool.
+    """
+    extractor = new_extractor(max_chars, encoding, backend)
+    # Feed in slices so streaming backends can stop once max_chars is reached
+    for start in range(0, len(data), _FEED_SLICE):
+        extractor.feed(data[start : start + _FEED_SLICE])
+        if extractor.done:
+            break
+    return extractor.result()
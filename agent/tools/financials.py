@@ -1,10 +1,28 @@
 from typing import Any, Dict, List
 
+from . import market_data, ticker_index
+from .context import memoize
+from .metrics import instrument
 from .search import web_search
 
 
+@instrument
 def detect_ticker(company: str, country: str = "") -> Dict[str, Any]:
-    """Attempt to detect a public ticker for the company via web search."""
+    """Attempt to detect a public ticker for the company.
+
+    - Checks the local index of listed companies first (no network)
+    - Falls back to a web search and reads the ticker from result titles
+    """
+    return memoize(
+        ("ticker", company.strip().lower(), country.strip().lower()),
+        lambda: _detect_ticker(company, country),
+    )
+
+
+def _detect_ticker(company: str, country: str) -> Dict[str, Any]:
+    listed = ticker_index.lookup(company, country)
+    if listed:
+        return {"status": "success", "data": {**listed, "sources": []}}
     q = f"{company} stock ticker"
     if country:
         q += f" {country}"
@@ -35,29 +53,15 @@ def detect_ticker(company: str, country: str = "") -> Dict[str, Any]:
     return {"status": "success", "data": {"ticker": ticker, "sources": sources}}
 
 
-def get_public_financials(ticker: str) -> Dict[str, Any]:
-    """Retrieve public market snapshot using yfinance if available."""
-    try:
-        import yfinance as yf
-
-        t = yf.Ticker(ticker)
-        info = {}
-        # fast_info when available
-        fi = getattr(t, "fast_info", None)
-        if fi is not None:
-            info["market_cap"] = getattr(fi, "market_cap", None)
-            info["currency"] = getattr(fi, "currency", None)
-        # try to fetch revenue from financials
-        try:
-            fin = t.financials
-            if fin is not None and not fin.empty:
-                if "Total Revenue" in fin.index:
-                    info["annual_revenue"] = float(fin.loc["Total Revenue"].iloc[0])
-        except Exception:  # noqa: BLE001
-            pass
+@instrument
+def get_public_financials(ticker: str, fast: bool = False) -> Dict[str, Any]:
+    """Retrieve a public market snapshot (market cap, currency, annual revenue) using yfinance.
 
+    - Quotes and statements are cached per ticker with separate freshness
+    - fast=True returns quote fields only (no financial statements download)
+    """
+    try:
+        info = market_data.lookup([ticker], fast=fast).get(market_data.normalize_ticker(ticker), {})
         return {"status": "success", "data": {"financials": info}}
     except Exception as e:  # noqa: BLE001
         return {"status": "error", "error_message": f"Failed to fetch financials for {ticker}: {e}"}
-
-
@@ -1,8 +1,17 @@
 from typing import Any, Dict, List
 
-from .search import web_search, fetch_url
+from . import compact, hedge
+from .metrics import instrument
+from .search import fetch_many, result_hrefs, web_search_many
+from .signals import funding_signals
+from .urls import dedupe_urls
 
+# Terms that make a funding snippet worth keeping
+_ROUND_TERMS = ("series", "seed", "round", "raised", "raises", "valuation", "led by", "million", "billion", "ipo")
+_INVESTOR_TERMS = ("led by", "investor", "participation", "capital", "ventures", "partners", "backed")
 
+
+@instrument
 def get_company_funding_summary(company: str, country: str = "", max_sources: int = 6) -> Dict[str, Any]:
     """Best-effort funding summary using public sources (press releases, news, Wikipedia).
 
@@ -25,47 +34,43 @@ def get_company_funding_summary(company: str, country: str = "", max_sources: in
     total_amount = None
     last_round: Dict[str, Any] | None = None
 
-    for q in queries:
-        res = web_search(q, max_results=5)
-        if res.get("status") != "success":
-            continue
-        for r in res.get("data", [])[:max_sources]:
-            href = r.get("href")
-            if not href:
-                continue
-            sources.append(href)
-            page = fetch_url(href)
-            if page.get("status") != "success":
-                continue
-            content = (page.get("data", {}) or {}).get("content", "")
-            # Naive pattern extraction
-            for marker in ["Series", "Seed", "Pre-Seed", "Angel", "Round", "IPO", "Grant"]:
-                if marker.lower() in content.lower():
-                    rounds.append({"text": content[:800], "source": href})
-                    break
-            # Investors
-            if "investor" in content.lower() or "led by" in content.lower():
-                investors.append({"text": content[:400], "source": href})  # type: ignore[arg-type]
-
-            # Try to capture amounts by simple $/€/£ pattern
-            import re
+    # Issue all searches, then all page fetches, concurrently; walk the results
+    # in query order afterwards so the output matches a serial run.
+    # Extra results per search stand in for pages that are slow to load
+    results = web_search_many(queries, max_results=5 + hedge.ALTERNATES)
+    hrefs, alternates = result_hrefs(results, min(5, max_sources))
+    # Syndicated copies of one article count (and are parsed) once
+    hrefs = dedupe_urls(hrefs)
+    pages = fetch_many(hrefs, alternates=alternates)
 
-            amt_matches = re.findall(r"\$\s?([0-9.,]+)\s?(million|billion|m|bn|b)?", content, flags=re.I)
-            if amt_matches:
-                # Keep the largest match as a proxy for total/round headline
-                def normalize(val: tuple[str, str | None]) -> float:
-                    num, unit = val
-                    n = float(num.replace(",", ""))
-                    unit = (unit or "").lower()
-                    if unit in ("billion", "bn", "b"):
-                        n *= 1_000
-                    return n
+    for href, page in pages.items():
+        # Pages that failed, lost a hedge or missed the deadline contributed nothing
+        if page.get("status") != "success":
+            continue
+        sources.append(href)
+        content = (page.get("data", {}) or {}).get("content", "")
+        # Naive pattern extraction, one scan per page; compact mode quotes the
+        # passage around the markers instead of the page's opening text
+        if compact.ENABLED:
+            signals = funding_signals(content, 400)
+            round_text, investor_text = signals["round_snippet"], signals["investor_snippet"]
+        else:
+            signals = funding_signals(content)
+            round_text, investor_text = content[:800], content[:400]
+        if signals["has_round"]:
+            rounds.append({"text": round_text, "source": href})
+        if signals["has_investor"]:
+            investors.append({"text": investor_text, "source": href})
+        # Keep the largest $ amount as a proxy for total/round headline
+        largest = signals["largest_amount"]
+        if largest is not None and (total_amount or 0) < largest:
+            total_amount = largest
+            last_round = {"headline_amount_usd_millions": largest, "source": href}
 
-                largest = max(amt_matches, key=normalize)
-                normalized = normalize(largest)
-                if (total_amount or 0) < normalized:
-                    total_amount = normalized
-                    last_round = {"headline_amount_usd_millions": normalized, "source": href}
+    # Syndicated press releases repeat the same passage across sites
+    budget = compact.budget("funding")
+    rounds = compact.compact_items(rounds, budget * 3 // 5, _ROUND_TERMS + (company,))
+    investors = compact.compact_items(investors, budget * 2 // 5, _INVESTOR_TERMS)
 
     # Build output
     return {
@@ -0,0 +1,149 @@
+"""Hedged page fetches.
+
+A fetch still running after the HEDGE_PERCENTILE (p90) latency of recent
+fetches is probably stuck in the tail. Rather than wait for it, `gather`
+starts one alternate URL in its place, another result of the same search, and
+the slot is filled by whichever answers first. Tools ask for HEDGE_ALTERNATES
+extra results per search to have alternates at hand. Until HEDGE_MIN_SAMPLES
+latencies are known the delay is HEDGE_DEFAULT_DELAY.
+
+`gather` also honors the report deadline (see tools.deadline). Once the budget
+is nearly gone it stops waiting and returns the results it has.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from . import deadline, metrics
+from .concurrency import MAX_PARALLEL
+
+# Latency percentile (0-1) after which a fetch is hedged; 0 disables hedging
+PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", "0.9"))
+# Extra results requested per search to serve as alternates
+ALTERNATES = int(os.environ.get("HEDGE_ALTERNATES", "2"))
+MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", "20"))
+DEFAULT_DELAY = float(os.environ.get("HEDGE_DEFAULT_DELAY", "4"))
+MIN_DELAY = float(os.environ.get("HEDGE_MIN_DELAY", "0.5"))
+# Recent fetch latencies the percentile is taken over
+WINDOW = 200
+
+_lock = threading.Lock()
+_latencies: Deque[float] = deque(maxlen=WINDOW)
+
+
+def record(seconds: float) -> None:
+    """Record the latency of one completed network fetch."""
+    with _lock:
+        _latencies.append(seconds)
+
+
+def delay() -> Optional[float]:
+    """Seconds after which a running fetch is hedged, or None when hedging is off."""
+    if PERCENTILE <= 0:
+        return None
+    with _lock:
+        samples = sorted(_latencies)
+    if len(samples) < MIN_SAMPLES:
+        return DEFAULT_DELAY
+    return max(MIN_DELAY, samples[min(len(samples) - 1, int(len(samples) * PERCENTILE))])
+
+
+def _wait_timeout(hedge_delay: Optional[float], started: Dict[str, float], waiting: List[str]) -> Optional[float]:
+    """How long to block before the next hedge is due or the deadline runs out."""
+    timeouts: List[float] = []
+    if hedge_delay is not None and waiting:
+        now = time.monotonic()
+        due = [started[item] + hedge_delay - now for item in waiting if item in started]
+        # Queued items start when a worker frees up; look again after one delay
+        timeouts.append(max(0.0, min(due, default=hedge_delay)))
+    left = deadline.remaining()
+    if left is not None:
+        timeouts.append(max(0.0, left - deadline.RESERVE))
+    return min(timeouts) if timeouts else None
+
+
+def gather(
+    fn: Callable[[str], Dict[str, Any]],
+    items: List[str],
+    alternates: Dict[str, List[str]],
+    max_workers: Optional[int] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """Run `fn` (returning a tool payload) for every item, hedging slow ones with their alternates.
+
+    An exception from `fn` becomes an error payload for that item.
+    Returns (results, winners): the payload of every call that finished, keyed
+    by item or alternate, and item -> alternate for slots an alternate filled.
+    Items still running when the report deadline nears have no result.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    winners: Dict[str, str] = {}
+    if not items:
+        return results, winners
+    workers = min(max_workers or MAX_PARALLEL, len(items))
+    started: Dict[str, float] = {}
+
+    def call(item: str) -> Dict[str, Any]:
+        # A failing item (e.g. a malformed URL) must not fail the whole gather
+        try:
+            return fn(item)
+        except Exception as e:  # noqa: BLE001
+            return {"status": "error", "error_message": f"{item}: {e}"}
+
+    def run(item: str) -> Dict[str, Any]:
+        started[item] = time.monotonic()
+        return call(item)
+
+    # Hedges get their own threads so they never queue behind primaries
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="research")
+    hedge_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="research-hedge")
+    # future -> (slot, item it fetches)
+    running: Dict[Future, Tuple[str, str]] = {
+        pool.submit(copy_context().run, run, item): (item, item) for item in items
+    }
+    open_slots = list(items)
+    hedged: Set[str] = set()
+    claimed = set(items)
+    try:
+        while open_slots:
+            hedge_delay = delay()
+            waiting = [s for s in open_slots if s not in hedged and alternates.get(s)]
+            done, _ = wait(
+                list(running), timeout=_wait_timeout(hedge_delay, started, waiting), return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                slot, item = running.pop(future)
+                results[item] = future.result()
+                if slot not in open_slots:
+                    continue
+                ok = results[item].get("status") == "success"
+                # A failed primary still waits for its hedge, and vice versa
+                if ok or all(s != slot for s, _ in running.values()):
+                    open_slots.remove(slot)
+                    if ok and item != slot:
+                        winners[slot] = item
+                        metrics.inc("research_hedged_fetches_total", {"outcome": "won"})
+            if deadline.exhausted():
+                break
+            if hedge_delay is None:
+                continue
+            now = time.monotonic()
+            for slot in waiting:
+                if slot not in open_slots or now - started.get(slot, now) < hedge_delay:
+                    continue
+                hedged.add(slot)
+                alt = next((a for a in alternates[slot] if a not in claimed), None)
+                if alt is not None:
+                    claimed.add(alt)
+                    running[hedge_pool.submit(copy_context().run, call, alt)] = (slot, alt)
+                    metrics.inc("research_hedged_fetches_total", {"outcome": "launched"})
+    finally:
+        # Losers and stragglers finish in the background (their timeouts are
+        # clamped to the deadline); nothing waits for them
+        pool.shutdown(wait=False, cancel_futures=True)
+        hedge_pool.shutdown(wait=False, cancel_futures=True)
+    return results, winners
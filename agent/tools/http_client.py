@@ -0,0 +1,152 @@
+"""Process-wide pooled HTTP client shared by every tool module.
+
+A single `httpx.Client` keeps connections alive between fetches so repeated hits
+on the same host (wikipedia.org, similarweb.com, ...) skip the TCP+TLS handshake.
+HTTP/2 is negotiated when the optional `h2` package is installed.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Pool sizing; override via env vars for larger deployments
+MAX_CONNECTIONS = int(os.environ.get("HTTP_MAX_CONNECTIONS", "64"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("HTTP_MAX_KEEPALIVE", "32"))
+KEEPALIVE_EXPIRY = float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "30"))
+# Maximum concurrent requests against a single host
+PER_HOST_LIMIT = int(os.environ.get("HTTP_PER_HOST_LIMIT", "6"))
+# Hosts whose slot semaphores are kept once no request holds them (least
+# recently used beyond this are dropped); configured domains are always kept
+MAX_TRACKED_HOSTS = int(os.environ.get("HTTP_MAX_TRACKED_HOSTS", "512"))
+
+
+def _parse_domain_limits(value: Optional[str]) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+    for item in (value or "").split(","):
+        domain, _, limit = item.partition("=")
+        if domain.strip() and limit.strip().isdigit():
+            limits[domain.strip().lower()] = int(limit)
+    return limits
+
+
+# Per-upstream-domain overrides, shared by every report in the process.
+# Example: export HTTP_DOMAIN_LIMITS="wikipedia.org=4,similarweb.com=2"
+DOMAIN_LIMITS = _parse_domain_limits(os.environ.get("HTTP_DOMAIN_LIMITS"))
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+class _HostSlots:
+    """Concurrency slots of one host, with the number of requests holding or awaiting one."""
+
+    def __init__(self, limit: int):
+        self.sem = threading.BoundedSemaphore(limit)
+        self.users = 0
+
+
+_host_slots: "OrderedDict[str, _HostSlots]" = OrderedDict()
+_host_slots_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _accept_encoding() -> str:
+    """Compression schemes httpx can decode here (br/zstd need optional packages)."""
+    encodings = ["gzip", "deflate"]
+    for name, modules in (("br", ("brotli", "brotlicffi")), ("zstd", ("zstandard",))):
+        for module in modules:
+            try:
+                __import__(module)
+            except ImportError:
+                continue
+            encodings.append(name)
+            break
+    return ", ".join(encodings)
+
+
+def get_client() -> httpx.Client:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    http2=_http2_available(),
+                    follow_redirects=True,
+                    headers={"User-Agent": USER_AGENT, "Accept-Encoding": _accept_encoding()},
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY,
+                    ),
+                )
+    return _client
+
+
+def close_client() -> None:
+    """Close the shared client (e.g. on server shutdown)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _slot_key(host: str) -> Tuple[str, int]:
+    """Semaphore key and size: a configured domain shares one budget across its subdomains."""
+    for domain, limit in DOMAIN_LIMITS.items():
+        if host == domain or host.endswith("." + domain):
+            return domain, limit
+    return host, PER_HOST_LIMIT
+
+
+def _evict_unused() -> None:
+    """Drop the least recently used idle hosts beyond MAX_TRACKED_HOSTS; caller holds _host_slots_lock.
+
+    A semaphore is only dropped while no request holds or awaits it, so the
+    per-host limit is never split across two semaphores.
+    """
+    excess = len(_host_slots) - MAX_TRACKED_HOSTS
+    for key in list(_host_slots):
+        if excess <= 0:
+            break
+        if _host_slots[key].users == 0 and key not in DOMAIN_LIMITS:
+            del _host_slots[key]
+            excess -= 1
+
+
+@contextmanager
+def host_slot(url: str) -> Iterator[None]:
+    """Hold one of the per-host connection slots for the duration of a request."""
+    key, limit = _slot_key((urlsplit(url).hostname or "").lower())
+    with _host_slots_lock:
+        slots = _host_slots.get(key)
+        if slots is None:
+            slots = _host_slots[key] = _HostSlots(limit)
+        else:
+            _host_slots.move_to_end(key)
+        slots.users += 1
+        _evict_unused()
+    try:
+        with slots.sem:
+            yield
+    finally:
+        with _host_slots_lock:
+            slots.users -= 1
@@ -0,0 +1,153 @@
+"""Market data for public companies, cached per ticker.
+
+Two groups of fields with their own freshness:
+
+- quote: market cap and currency from yfinance `fast_info` (MARKET_CACHE_TTL_QUOTE, 15m)
+- statement: annual revenue from the income statement (MARKET_CACHE_TTL_STATEMENT, 7d)
+
+`lookup` serves cached groups from SQLite and fetches only the stale ones.
+Nothing is batched upstream: yfinance has no bulk call for these fields
+(`yf.download` returns prices only), so each ticker is its own request. Callers
+(get_public_financials, prefetch) pass one ticker; several are fetched in
+parallel. `fast=True` skips the statement group, which pulls a whole financials
+frame.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .concurrency import parallel_map
+from .store import connect
+
+ENABLED = os.environ.get("MARKET_CACHE", "1").lower() in ("1", "true", "yes")
+
+# Freshness per field group, in seconds
+TTLS: Dict[str, int] = {
+    "quote": int(os.environ.get("MARKET_CACHE_TTL_QUOTE", str(15 * 60))),
+    "statement": int(os.environ.get("MARKET_CACHE_TTL_STATEMENT", str(7 * 24 * 3600))),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS market_data (
+    ticker TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (ticker, kind)
+);
+"""
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += n
+
+
+def stats() -> Dict[str, int]:
+    """Hit/miss counters (per ticker and field group) since process start."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def normalize_ticker(ticker: str) -> str:
+    return ticker.strip().upper()
+
+
+def _cached(tickers: List[str], kind: str) -> Dict[str, Dict[str, Any]]:
+    if not ENABLED or not tickers:
+        return {}
+    try:
+        placeholders = ",".join("?" * len(tickers))
+        rows = connect("market", _SCHEMA).execute(
+            f"SELECT ticker, data, fetched_at FROM market_data WHERE kind = ? AND ticker IN ({placeholders})",
+            (kind, *tickers),
+        ).fetchall()
+    except (sqlite3.Error, OSError):
+        return {}
+    now = time.time()
+    return {ticker: json.loads(data) for ticker, data, fetched_at in rows if now - fetched_at < TTLS[kind]}
+
+
+def _store(kind: str, fetched: Dict[str, Dict[str, Any]]) -> None:
+    if not ENABLED or not fetched:
+        return
+    now = time.time()
+    try:
+        conn = connect("market", _SCHEMA)
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO market_data VALUES (?, ?, ?, ?)",
+                [(ticker, kind, json.dumps(data), now) for ticker, data in fetched.items()],
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def _quote(t: Any) -> Optional[Dict[str, Any]]:
+    fi = getattr(t, "fast_info", None)
+    if fi is None:
+        return None
+    data: Dict[str, Any] = {}
+    for field in ("market_cap", "currency"):
+        try:
+            value = getattr(fi, field, None)
+        except Exception:  # noqa: BLE001
+            value = None
+        # numpy scalars -> plain JSON numbers
+        data[field] = float(value) if field == "market_cap" and value is not None else value
+    # Unknown symbols come back with nothing set; don't cache that
+    return data if any(v is not None for v in data.values()) else None
+
+
+def _statement(t: Any) -> Optional[Dict[str, Any]]:
+    try:
+        fin = t.financials
+    except Exception:  # noqa: BLE001
+        return None
+    if fin is None or fin.empty or "Total Revenue" not in fin.index:
+        return None
+    return {"annual_revenue": float(fin.loc["Total Revenue"].iloc[0])}
+
+
+def lookup(tickers: Iterable[str], fast: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Financial fields per normalized ticker: market_cap, currency and (unless fast) annual_revenue.
+
+    Raises ImportError when yfinance is not installed and something has to be fetched.
+    """
+    symbols = list(dict.fromkeys(normalize_ticker(t) for t in tickers if t and t.strip()))
+    kinds = {"quote": _quote} if fast else {"quote": _quote, "statement": _statement}
+    groups: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    missing: Dict[str, List[str]] = {}
+    for kind in kinds:
+        groups[kind] = _cached(symbols, kind)
+        missing[kind] = [s for s in symbols if s not in groups[kind]]
+        _count("hits", len(groups[kind]))
+        _count("misses", len(missing[kind]))
+
+    to_fetch = list(dict.fromkeys(s for kind in kinds for s in missing[kind]))
+    if to_fetch:
+        import yfinance as yf
+
+        handles = {s: yf.Ticker(s) for s in to_fetch}
+        for kind, read in kinds.items():
+            if not missing[kind]:
+                continue
+            values = parallel_map(lambda s, read=read: read(handles[s]), missing[kind])
+            fetched = {s: v for s, v in zip(missing[kind], values) if v is not None}
+            _store(kind, fetched)
+            groups[kind].update(fetched)
+
+    result: Dict[str, Dict[str, Any]] = {}
+    for s in symbols:
+        info: Dict[str, Any] = {}
+        for kind in kinds:
+            info.update(groups[kind].get(s) or {})
+        result[s] = info
+    return result
@@ -0,0 +1,214 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Tools record into module-level counters and histograms. Cache, pool and
+upstream statistics are read from their modules at scrape time. `render()`
+produces the body served on GET /metrics.
+
+Per-domain labels are off by default: fetched domains are unbounded, so
+without METRICS_DOMAIN_LABELS=1 they are collapsed into domain="all".
+"""
+
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+DOMAIN_LABELS = os.environ.get("METRICS_DOMAIN_LABELS", "0").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 80.0)
+
+_Labels = Tuple[Tuple[str, str], ...]
+
+# name -> (type, help)
+_METRICS: Dict[str, Tuple[str, str]] = {
+    "research_tool_calls_total": ("counter", "Tool calls by outcome (success, error, exception)."),
+    "research_tool_duration_seconds": ("histogram", "Tool call latency."),
+    "research_fetch_requests_total": ("counter", "HTTP fetches by status class."),
+    "research_fetch_bytes_total": ("counter", "Response body bytes downloaded by fetch_url."),
+    "research_fetch_duration_seconds": ("histogram", "Time to fetch and extract one page (network + parse)."),
+    "research_pages_parsed_total": ("counter", "HTML pages parsed, in-process or in the parse pool."),
+    "research_deadline_skips_total": ("counter", "Searches and fetches skipped near the report deadline."),
+    "research_hedged_fetches_total": ("counter", "Hedge fetches of alternate results by outcome (launched, won)."),
+}
+
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, _Labels], float] = {}
+# (name, labels) -> [per-bucket counts..., sum, count]
+_histograms: Dict[Tuple[str, _Labels], List[float]] = {}
+
+
+def _key(name: str, labels: Optional[Dict[str, str]]) -> Tuple[str, _Labels]:
+    return name, tuple(sorted((labels or {}).items()))
+
+
+def inc(name: str, labels: Optional[Dict[str, str]] = None, value: float = 1) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
+    key = _key(name, labels)
+    with _lock:
+        series = _histograms.get(key)
+        if series is None:
+            series = _histograms[key] = [0.0] * (len(LATENCY_BUCKETS) + 2)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+
+def domain_label(url: str) -> str:
+    """`domain` label value for `url`: its host when domain labels are on, else "all"."""
+    if not DOMAIN_LABELS:
+        return "all"
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def instrument(fn: F) -> F:
+    """Record call count by outcome and latency for a tool function.
+
+    functools.wraps keeps the name, docstring and signature that ADK reads to
+    build the tool declaration.
+    """
+    tool = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = fn(*args, **kwargs)
+            outcome = "error" if isinstance(result, dict) and result.get("status") == "error" else "success"
+            return result
+        finally:
+            observe("research_tool_duration_seconds", time.perf_counter() - started, {"tool": tool})
+            inc("research_tool_calls_total", {"tool": tool, "status": outcome})
+
+    return wrapper  # type: ignore[return-value]
+
+
+# --- exposition --------------------------------------------------------------
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    items = [f'{k}="{_escape(str(v))}"' for k, v in labels]
+    return "{" + ",".join(items) + "}" if items else ""
+
+
+def _fmt_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# Metrics read from other modules at scrape time: name -> (type, help)
+_COLLECTED: Dict[str, Tuple[str, str]] = {
+    "research_cache_events_total": ("counter", "Cache events by cache and kind."),
+    "research_cache_hit_ratio": ("gauge", "Cache hits / lookups since start."),
+    "research_ddgs_pool": ("gauge", "Search client pool counters and occupancy."),
+    "research_upstream_circuits_open": ("gauge", "Upstream circuit breakers not closed."),
+    "research_upstream_events_total": ("counter", "Upstream calls, failures, retries and fail-fast rejections."),
+}
+
+
+def _collected() -> List[Tuple[str, Dict[str, str], float]]:
+    """(name, labels, value) samples read from the caches, search pool and upstreams."""
+    from . import ddgs_pool, entity_store, market_data, page_cache, report_cache, resilience, search_cache, singleflight
+
+    samples: List[Tuple[str, Dict[str, str], float]] = []
+    caches = {
+        "page": (page_cache.stats(), ("hits",)),
+        "search": (search_cache.stats(), ("memory_hits", "disk_hits")),
+        "report": (report_cache.stats(), ("fresh_hits", "stale_hits")),
+        "market": (market_data.stats(), ("hits",)),
+        "entity": (entity_store.stats(), ("hits",)),
+    }
+    for cache, (counts, hit_keys) in caches.items():
+        for event, n in counts.items():
+            samples.append(("research_cache_events_total", {"cache": cache, "event": event}, n))
+        hits = sum(counts.get(k, 0) for k in hit_keys)
+        lookups = hits + counts.get("misses", 0)
+        if lookups:
+            samples.append(("research_cache_hit_ratio", {"cache": cache}, hits / lookups))
+    # Fetches that joined one already in flight (or just finished) for the same document
+    flights = singleflight.stats()
+    for event in ("calls", "shared"):
+        samples.append(("research_cache_events_total", {"cache": "singleflight", "event": event}, flights[event]))
+
+    for stat, n in ddgs_pool.stats().items():
+        samples.append(("research_ddgs_pool", {"stat": stat}, n))
+
+    # Fetch domains fold into one series unless domain labels are on
+    events = ("calls", "failures", "retries", "rejected")
+    upstreams: Dict[str, Dict[str, int]] = {}
+    for name, snap in resilience.snapshot().items():
+        if name.startswith("fetch:") and not DOMAIN_LABELS:
+            name = "fetch:all"
+        merged = upstreams.setdefault(name, dict.fromkeys(("open",) + events, 0))
+        merged["open"] += snap["state"] != "closed"
+        for event in events:
+            merged[event] += snap[event]
+    # Upstreams forgotten after going idle or a reset keep counting toward the totals
+    for kind, counts in resilience.retired().items():
+        name = "fetch:all" if kind == "fetch" and not DOMAIN_LABELS else f"{kind}:evicted"
+        merged = upstreams.setdefault(name, dict.fromkeys(("open",) + events, 0))
+        for event in events:
+            merged[event] += counts[event]
+    for name, merged in upstreams.items():
+        samples.append(("research_upstream_circuits_open", {"upstream": name}, merged["open"]))
+        for event in events:
+            samples.append(("research_upstream_events_total", {"upstream": name, "event": event}, merged[event]))
+    return samples
+
+
+def render() -> str:
+    """All metrics of this process in Prometheus text format (version 0.0.4).
+
+    Every sample carries a `worker` label (the process id): with several server
+    workers each scrape reaches one of them, so sum over `worker` to aggregate.
+    """
+    worker = (("worker", str(os.getpid())),)
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: list(v) for k, v in _histograms.items()}
+
+    lines: List[str] = []
+    for name, (kind, help_text) in _METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == "counter":
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(f"{name}{_fmt_labels(labels + worker)} {_fmt_value(value)}")
+            continue
+        for (n, labels), series in sorted(histograms.items()):
+            if n != name:
+                continue
+            labels = labels + worker
+            cumulative = 0.0
+            for bound, count in zip(LATENCY_BUCKETS, series):
+                cumulative += count
+                lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', repr(bound)),))} {_fmt_value(cumulative)}")
+            lines.append(f"{name}_bucket{_fmt_labels(labels + (('le', '+Inf'),))} {_fmt_value(series[-1])}")
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {repr(series[-2])}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {_fmt_value(series[-1])}")
+
+    samples = _collected()
+    for name, (kind, help_text) in _COLLECTED.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for n, labels, value in samples:
+            if n == name:
+                lines.append(f"{name}{_fmt_labels(sorted(labels.items()) + list(worker))} {_fmt_value(value)}")
+    return "\n".join(lines) + "\n"
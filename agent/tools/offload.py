@@ -0,0 +1,76 @@
+"""Bounded process pool for CPU-bound HTML parsing.
+
+HTML parsing holds the GIL, so under concurrent sessions a large page stalls
+every other request served by the same uvicorn worker. Large documents are
+shipped to worker processes as raw bytes (the compact, undecoded form); small
+ones run in-process where the IPC would cost more than the work. Keyword scans
+over extracted text (at most a fetch's max_chars) always run in-process.
+
+Workers are started with forkserver (spawn where it is unavailable): forking
+this heavily threaded server could copy locks held by other threads (logging,
+sqlite, httpx) into the child, where nothing would ever release them.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+# Worker processes; 0 disables offloading entirely
+PROCESSES = int(os.environ.get("PARSE_PROCESSES", str(min(4, os.cpu_count() or 1))))
+# Documents smaller than this are parsed in-process
+MIN_BYTES = int(os.environ.get("PARSE_OFFLOAD_MIN_BYTES", str(64 * 1024)))
+# Jobs in flight or queued per worker before callers block
+QUEUE_PER_PROCESS = 2
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(1, PROCESSES * QUEUE_PER_PROCESS))
+
+
+def enabled() -> bool:
+    return PROCESSES > 0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                if "forkserver" in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context("forkserver")
+                    # The fork server imports the main script (as __mp_main__)
+                    # and the parser once; workers are forked from it ready to go
+                    context.set_forkserver_preload(["__main__", "tools.extract"])
+                else:
+                    context = multiprocessing.get_context("spawn")
+                _pool = ProcessPoolExecutor(max_workers=PROCESSES, mp_context=context)
+    return _pool
+
+
+def shutdown() -> None:
+    """Stop the worker processes (e.g. on server shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def run_cpu(fn: Callable[..., Any], payload: Any, *args: Any, size: Optional[int] = None) -> Any:
+    """Run `fn(payload, *args)` in the process pool, or in-process for small payloads.
+
+    `fn` must be a module-level function so it can be pickled. `size` defaults
+    to len(payload).
+    """
+    if not enabled() or (len(payload) if size is None else size) < MIN_BYTES:
+        return fn(payload, *args)
+    with _slots:
+        try:
+            return _get_pool().submit(fn, payload, *args).result()
+        except BrokenProcessPool:
+            # A worker died (OOM, signal); start a fresh pool next time and do this one here
+            shutdown()
+            return fn(payload, *args)
@@ -0,0 +1,173 @@
+"""On-disk cache of extracted page text for fetch_url.
+
+Entries are keyed by canonical URL and hold the post-extraction title/text, so a
+hit never re-runs HTML parsing. Stale entries carrying an ETag or Last-Modified
+are revalidated with a conditional request instead of a full download.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+from .store import connect
+
+ENABLED = os.environ.get("PAGE_CACHE", "1").lower() in ("1", "true", "yes")
+MAX_BYTES = int(float(os.environ.get("PAGE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+# Freshness per content class, in seconds
+TTLS: Dict[str, int] = {
+    "reference": int(os.environ.get("PAGE_CACHE_TTL_REFERENCE", str(7 * 24 * 3600))),
+    "profile": int(os.environ.get("PAGE_CACHE_TTL_PROFILE", str(24 * 3600))),
+    "news": int(os.environ.get("PAGE_CACHE_TTL_NEWS", str(6 * 3600))),
+    "default": int(os.environ.get("PAGE_CACHE_TTL_DEFAULT", str(24 * 3600))),
+}
+
+_REFERENCE_HOSTS = ("wikipedia.org", "wikidata.org", "britannica.com")
+_PROFILE_HOSTS = ("crunchbase.com", "similarweb.com", "linkedin.com", "pitchbook.com", "cbinsights.com", "tracxn.com")
+_NEWS_HOSTS = ("reuters.com", "bloomberg.com", "techcrunch.com", "prnewswire.com", "businesswire.com", "cnbc.com")
+_NEWS_PATH_HINTS = ("/news", "/press", "/blog", "/article")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    title TEXT,
+    content TEXT NOT NULL,
+    truncated INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    content_class TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at);
+"""
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "revalidated": 0, "evicted": 0}
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += n
+
+
+def stats() -> Dict[str, int]:
+    """Hit/miss/revalidation/eviction counters since process start."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def content_class(url: str) -> str:
+    """Classify a URL into a TTL bucket: reference, profile, news or default."""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if any(host == h or host.endswith("." + h) for h in _REFERENCE_HOSTS):
+        return "reference"
+    if any(host == h or host.endswith("." + h) for h in _PROFILE_HOSTS):
+        return "profile"
+    if any(host == h or host.endswith("." + h) for h in _NEWS_HOSTS):
+        return "news"
+    if any(hint in parts.path.lower() for hint in _NEWS_PATH_HINTS):
+        return "news"
+    return "default"
+
+
+def lookup(key: str, max_chars: int) -> Optional[Dict[str, Any]]:
+    """Return the cached entry for `key` if it can serve `max_chars` characters.
+
+    Adds a `fresh` flag; stale entries are still returned so callers can revalidate.
+    """
+    if not ENABLED:
+        return None
+    try:
+        row = connect("pages", _SCHEMA).execute(
+            "SELECT title, content, truncated, etag, last_modified, content_class, fetched_at FROM pages WHERE url = ?",
+            (key,),
+        ).fetchone()
+    except (sqlite3.Error, OSError):
+        # The cache is an optimization; a broken store degrades to a miss
+        row = None
+    if row is None:
+        _count("misses")
+        return None
+    title, content, truncated, etag, last_modified, klass, fetched_at = row
+    # A truncated entry only covers requests for at most as many characters
+    if truncated and len(content) < max_chars:
+        _count("misses")
+        return None
+    fresh = time.time() - fetched_at < TTLS.get(klass, TTLS["default"])
+    if fresh:
+        _count("hits")
+        _touch(key, refetched=False)
+    return {
+        "title": title,
+        "content": content[:max_chars],
+        "etag": etag,
+        "last_modified": last_modified,
+        "fresh": fresh,
+    }
+
+
+def revalidated(key: str) -> None:
+    """Record a 304 Not Modified: the entry is fresh again."""
+    _count("revalidated")
+    _touch(key, refetched=True)
+
+
+def _touch(key: str, refetched: bool) -> None:
+    now = time.time()
+    try:
+        conn = connect("pages", _SCHEMA)
+        with conn:
+            if refetched:
+                conn.execute("UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE url = ?", (now, now, key))
+            else:
+                conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, key))
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def store(
+    key: str,
+    title: Optional[str],
+    content: str,
+    truncated: bool,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+) -> None:
+    """Insert or replace an entry, then evict least-recently-used pages over the size cap."""
+    if not ENABLED:
+        return
+    now = time.time()
+    size = len(content.encode("utf-8")) + len((title or "").encode("utf-8"))
+    try:
+        conn = connect("pages", _SCHEMA)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, title, content, int(truncated), etag, last_modified, content_class(key), now, now, size),
+            )
+        _evict(conn)
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def _evict(conn) -> None:
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+    if total <= MAX_BYTES:
+        return
+    # Trim to 90% of the cap so eviction does not run on every insert
+    target = int(MAX_BYTES * 0.9)
+    victims = []
+    for url, size in conn.execute("SELECT url, size FROM pages ORDER BY accessed_at"):
+        if total <= target:
+            break
+        victims.append((url,))
+        total -= size
+    with conn:
+        conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+    _count("evicted", len(victims))
@@ -0,0 +1,92 @@
+"""Parallel prefetch of every research tool ahead of a single LLM turn.
+
+In pipeline mode the agent does not call tools itself: the company/country is
+parsed from the user message, all research tools run concurrently, and their
+combined output is handed to the model for one JSON synthesis turn.
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .concurrency import run_parallel
+from .context import bind_invocation
+from .entities import detect_official_website
+from .financials import detect_ticker, get_public_financials
+from .funding import get_company_funding_summary
+from .profiles import get_company_competitors, get_company_leadership, get_company_overview
+from .search import news_search
+from .traffic import get_web_traffic_summary
+
+_COUNTRY_RE = re.compile(r"^(?P<company>.*?)[\s,;]*\bcountry\s*[:=]\s*(?P<country>.+?)[\s.]*$", re.I | re.S)
+
+
+def parse_company_request(text: str) -> Tuple[str, str]:
+    """Split "Acme Corp, country: USA" into ("Acme Corp", "USA"); the country is optional."""
+    text = " ".join((text or "").split())
+    m = _COUNTRY_RE.match(text)
+    company, country = (m.group("company"), m.group("country")) if m else (text, "")
+    return company.strip(" \"'.,;"), country.strip(" \"'.,;")
+
+
+def _website(company: str, country: str) -> str:
+    res = detect_official_website(company, country)
+    if res.get("status") != "success":
+        return ""
+    return (res.get("data", {}) or {}).get("website") or ""
+
+
+def _ticker_and_financials(company: str, country: str) -> Dict[str, Any]:
+    res = detect_ticker(company, country)
+    ticker = (res.get("data", {}) or {}).get("ticker") if res.get("status") == "success" else None
+    if not ticker:
+        return res
+    return {"status": "success", "data": {**res["data"], "financials": get_public_financials(ticker)}}
+
+
+def research_jobs(company: str, country: str = "") -> Dict[str, Callable[[], Dict[str, Any]]]:
+    """Zero-argument callables for every research tool, keyed by result name."""
+    return {
+        "ticker": lambda: _ticker_and_financials(company, country),
+        "overview": lambda: get_company_overview(company, country),
+        "leadership": lambda: get_company_leadership(company, country),
+        "competitors": lambda: get_company_competitors(company, country),
+        "funding": lambda: get_company_funding_summary(company, country),
+        # Shares the memoized website lookup with the overview/leadership tools
+        "web_traffic": lambda: get_web_traffic_summary(company, _website(company, country)),
+        "news": lambda: news_search(company, max_results=10),
+    }
+
+
+def prefetch_research(company: str, country: str = "") -> Dict[str, Any]:
+    """Run every research tool concurrently and return their outputs by name."""
+    jobs = research_jobs(company, country)
+    results = run_parallel(*jobs.values(), max_workers=len(jobs))
+    return dict(zip(jobs.keys(), results))
+
+
+def user_text(content: Any) -> str:
+    """Plain text of a user message."""
+    if content is None or not content.parts:
+        return ""
+    return "".join(p.text or "" for p in content.parts)
+
+
+async def prefetch_before_model(callback_context: Any, llm_request: Any) -> Optional[Any]:
+    """ADK before_model_callback: attach prefetched research to the model request."""
+    from google.genai import types
+
+    company, country = parse_company_request(user_text(callback_context.user_content))
+    if not company:
+        return None
+    bind_invocation(callback_context.invocation_id)
+    # Tools are blocking; run them off the event loop (contextvars are copied)
+    research = await asyncio.to_thread(prefetch_research, company, country)
+    payload = json.dumps(
+        {"company": company, "country": country or None, "research": research}, default=str, ensure_ascii=False
+    )
+    llm_request.contents.append(
+        types.Content(role="user", parts=[types.Part(text=f"Research data (tool outputs, JSON):\n{payload}")])
+    )
+    return None
@@ -1,28 +1,23 @@
-from typing import Any, Dict, List, Optional
-
-from .search import web_search, fetch_url
-
-
-def _result_url(results: List[Dict[str, Any]]) -> Optional[str]:
-    for r in results:
-        href = r.get("href") or r.get("url")
-        if href:
-            return href
-    return None
-
-
-def detect_official_website(company: str, country: str = "") -> Dict[str, Any]:
-    """Attempt to detect the official website of a company using web search."""
-    query = f"{company} official website"
-    if country:
-        query += f" {country}"
-    res = web_search(query, max_results=5)
-    if res.get("status") != "success":
-        return res
-    url = _result_url(res["data"]) if res.get("data") else None
-    return {"status": "success", "data": {"website": url, "sources": [r.get("href") for r in res.get("data", []) if r.get("href")]}}
-
-
+from typing import Any, Dict, List
+
+from . import compact
+from .concurrency import run_parallel
+from .entities import (
+    detect_official_website,
+    find_linkedin_url,
+    find_twitter_url,
+    find_wikipedia_url,
+)
+from .metrics import instrument
+from .search import fetch_many, fetch_url, web_search, web_search_many
+from .signals import overview_fields, site_leadership_lines, wiki_leadership_lines
+from .urls import dedupe_urls
+
+# Terms that make a leadership line worth keeping
+_ROLE_TERMS = ("founder", "ceo", "chief", "cto", "cfo", "coo", "president", "chair", "vp", "head of")
+
+
+@instrument
 def get_company_overview(company: str, country: str = "") -> Dict[str, Any]:
     """Build a basic overview from public web sources (best-effort).
 
@@ -32,73 +27,44 @@ def get_company_overview(company: str, country: str = "") -> Dict[str, Any]:
     sources: List[str] = []
     overview: Dict[str, Any] = {"name": company}
 
+    # Website detection and the Wikipedia/LinkedIn/X lookups are independent;
+    # all four are shared with other tools through the research context.
+    site_res, wiki_url, linkedin_url, twitter_url = run_parallel(
+        lambda: detect_official_website(company, country),
+        lambda: find_wikipedia_url(company, country),
+        lambda: find_linkedin_url(company),
+        lambda: find_twitter_url(company),
+    )
+
     # 1) Official website
-    site_res = detect_official_website(company, country)
     if site_res.get("status") == "success":
         overview["website"] = site_res.get("data", {}).get("website")
         sources.extend(site_res.get("data", {}).get("sources", []))
 
     # 2) Wikipedia page
-    wiki_query = f"{company} wikipedia"
-    if country:
-        wiki_query += f" {country}"
-    wiki_res = web_search(wiki_query, max_results=3)
-    if wiki_res.get("status") == "success":
-        wiki_url = None
-        for r in wiki_res.get("data", []):
-            href = r.get("href")
-            if href and "wikipedia.org" in href:
-                wiki_url = href
-                break
-        if wiki_url:
-            sources.append(wiki_url)
-            page = fetch_url(wiki_url)
-            if page.get("status") == "success":
-                content = page.get("data", {}).get("content", "")
-                # Very light heuristics
-                # Sector/Industry
-                for key in ["Industry", "industry"]:
-                    idx = content.lower().find("industry")
-                    if idx != -1:
-                        segment = content[idx: idx + 400]
-                        overview.setdefault("industry", segment.split("\n")[0].split(":")[-1].strip())
-                        break
-                # Headquarters
-                for label in ["Headquarters", "Headquarter", "Head office"]:
-                    idx = content.lower().find(label.lower())
-                    if idx != -1:
-                        segment = content[idx: idx + 200]
-                        overview.setdefault("hq", segment.split("\n")[0].split(":")[-1].strip())
-                        break
-                # Founded
-                idx = content.lower().find("founded")
-                if idx != -1:
-                    segment = content[idx: idx + 200]
-                    overview.setdefault("founded_year", segment.split("\n")[0].split(":")[-1].strip())
+    if wiki_url:
+        sources.append(wiki_url)
+        page = fetch_url(wiki_url)
+        if page.get("status") == "success":
+            content = page.get("data", {}).get("content", "")
+            # Very light heuristics: industry, headquarters, founded
+            for field, value in overview_fields(content).items():
+                overview.setdefault(field, value)
 
     # 3) LinkedIn page
-    li_res = web_search(f"{company} LinkedIn company page", max_results=3)
-    if li_res.get("status") == "success":
-        for r in li_res.get("data", []):
-            href = r.get("href") or ""
-            if "linkedin.com/company" in href:
-                overview["linkedin_url"] = href
-                sources.append(href)
-                break
+    if linkedin_url:
+        overview["linkedin_url"] = linkedin_url
+        sources.append(linkedin_url)
 
     # 4) Twitter/X profile
-    x_res = web_search(f"{company} Twitter official", max_results=3)
-    if x_res.get("status") == "success":
-        for r in x_res.get("data", []):
-            href = r.get("href") or ""
-            if "twitter.com" in href or "x.com" in href:
-                overview["twitter_url"] = href
-                sources.append(href)
-                break
+    if twitter_url:
+        overview["twitter_url"] = twitter_url
+        sources.append(twitter_url)
 
     return {"status": "success", "data": {"overview": overview, "sources": list(dict.fromkeys(sources))}}
 
 
+@instrument
 def get_company_leadership(company: str, country: str = "", max_people: int = 10) -> Dict[str, Any]:
     """Identify founders and key decision makers using public sources."""
     sources: List[str] = []
@@ -108,33 +74,21 @@ def get_company_leadership(company: str, country: str = "", max_people: int = 10
     wiki_query = f"{company} founders site:wikipedia.org"
     if country:
         wiki_query += f" {country}"
-    wiki_res = web_search(wiki_query, max_results=5)
+    wiki_res, site_res, wiki_url = run_parallel(
+        lambda: web_search(wiki_query, max_results=5),
+        lambda: detect_official_website(company, country),
+        lambda: find_wikipedia_url(company, country),
+    )
+    # Start with the company's own article (shared with get_company_overview)
+    wiki_hrefs: List[str] = [wiki_url] if wiki_url else []
     if wiki_res.get("status") == "success":
         for r in wiki_res.get("data", []):
             href = r.get("href")
-            if href and "wikipedia.org" in href:
-                sources.append(href)
-                page = fetch_url(href)
-                if page.get("status") == "success":
-                    content = page.get("data", {}).get("content", "")
-                    # Basic heuristics to find names around keywords
-                    for kw in ["Founded by", "Founder", "Founders", "Key people", "Chief Executive Officer", "CEO", "CFO", "CTO"]:
-                        idx = 0
-                        while True:
-                            p = content.find(kw)
-                            if p == -1:
-                                break
-                            segment = content[p : p + 400]
-                            # Extract candidate names (very naive split)
-                            lines = [ln for ln in segment.split("\n") if ln.strip()]
-                            for ln in lines:
-                                if any(t in ln for t in ["CEO", "CFO", "CTO", "Founder", "founder", "Chief", "President", "Chairman", "Chairwoman"]):
-                                    if len(people) < max_people:
-                                        people.append({"text": ln.strip(), "source": href})
-                            content = content[p + len(kw) :]
+            if href and "wikipedia.org" in href and href not in wiki_hrefs:
+                wiki_hrefs.append(href)
 
     # Company website leadership page if present
-    site_res = detect_official_website(company, country)
+    about_hrefs: List[str] = []
     site = site_res.get("data", {}).get("website") if site_res.get("status") == "success" else None
     if site:
         about_res = web_search(f"site:{site} leadership OR team OR management OR founders", max_results=5)
@@ -142,34 +96,36 @@ def get_company_leadership(company: str, country: str = "", max_people: int = 10
             for r in about_res.get("data", []):
                 href = r.get("href")
                 if href and href.startswith("http"):
-                    sources.append(href)
-                    page = fetch_url(href)
-                    if page.get("status") == "success":
-                        content = page.get("data", {}).get("content", "")
-                        lines = [ln for ln in content.split("\n") if ln.strip()]
-                        for ln in lines:
-                            if any(
-                                t in ln
-                                for t in [
-                                    "CEO",
-                                    "CFO",
-                                    "CTO",
-                                    "COO",
-                                    "Chief",
-                                    "Founder",
-                                    "founder",
-                                    "VP",
-                                    "Vice President",
-                                    "President",
-                                    "Head of",
-                                ]
-                            ):
-                                if len(people) < max_people:
-                                    people.append({"text": ln.strip(), "source": href})
-
+                    about_hrefs.append(href)
+
+    wiki_hrefs, about_hrefs = dedupe_urls(wiki_hrefs), dedupe_urls(about_hrefs)
+    pages = fetch_many(wiki_hrefs + about_hrefs)
+    # Overlapping anchors repeat lines; compact mode gathers extra and drops duplicates below
+    limit = max_people * 3 if compact.ENABLED else max_people
+
+    for href in wiki_hrefs:
+        sources.append(href)
+        page = pages[href]
+        if page.get("status") == "success":
+            content = page.get("data", {}).get("content", "")
+            # Basic heuristics to find names around keywords
+            for ln in wiki_leadership_lines(content, limit - len(people)):
+                people.append({"text": ln, "source": href})
+
+    for href in about_hrefs:
+        sources.append(href)
+        page = pages[href]
+        if page.get("status") == "success":
+            content = page.get("data", {}).get("content", "")
+            for ln in site_leadership_lines(content, limit - len(people)):
+                people.append({"text": ln, "source": href})
+
+    # The article and the company's own page often list the same people
+    people = compact.compact_items(people, compact.budget("leadership"), _ROLE_TERMS, item_chars=200)[:max_people]
     return {"status": "success", "data": {"people": people, "sources": list(dict.fromkeys(sources))}}
 
 
+@instrument
 def get_company_competitors(company: str, country: str = "", max_competitors: int = 10) -> Dict[str, Any]:
     """Find competitors from public sources (best-effort)."""
     sources: List[str] = []
@@ -183,8 +139,7 @@ def get_company_competitors(company: str, country: str = "", max_competitors: in
     if country:
         queries = [q + f" {country}" for q in queries]
 
-    for q in queries:
-        res = web_search(q, max_results=10)
+    for res in web_search_many(queries, max_results=10):
         if res.get("status") == "success":
             for r in res.get("data", []):
                 href = r.get("href")
@@ -0,0 +1,203 @@
+"""Cache of final agent reports, keyed by normalized (company, country).
+
+Each report section has its own freshness window. A report whose sections are
+all fresh is served as is. Once any section is past its window the report is
+stale: it is still served, and a background refresh regenerates it. Reports
+older than REPORT_CACHE_MAX_AGE are not served at all.
+
+The refresh runs through a refresher registered by the server (see
+api/reports.py). Without one (e.g. under `adk api_server`), stale reports are
+treated as misses and regenerated inline.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .prefetch import parse_company_request, user_text
+from .store import connect
+
+ENABLED = os.environ.get("REPORT_CACHE", "1").lower() in ("1", "true", "yes")
+MAX_AGE = int(os.environ.get("REPORT_CACHE_MAX_AGE", str(30 * 24 * 3600)))
+# Background refreshes running at once
+REFRESH_CONCURRENCY = int(os.environ.get("REPORT_CACHE_REFRESH_CONCURRENCY", "2"))
+
+# Freshness per report section, in seconds
+SECTION_TTLS: Dict[str, int] = {
+    "company": int(os.environ.get("REPORT_CACHE_TTL_COMPANY", str(7 * 24 * 3600))),
+    "founders_leadership": int(os.environ.get("REPORT_CACHE_TTL_LEADERSHIP", str(7 * 24 * 3600))),
+    "competitors": int(os.environ.get("REPORT_CACHE_TTL_COMPETITORS", str(7 * 24 * 3600))),
+    "funding": int(os.environ.get("REPORT_CACHE_TTL_FUNDING", str(24 * 3600))),
+    "web_traffic": int(os.environ.get("REPORT_CACHE_TTL_WEB_TRAFFIC", str(24 * 3600))),
+    "news": int(os.environ.get("REPORT_CACHE_TTL_NEWS", str(3 * 3600))),
+}
+
+# Session state key that bypasses the cache for an invocation
+FORCE_REFRESH_KEY = "force_refresh"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    key TEXT PRIMARY KEY,
+    company TEXT NOT NULL,
+    country TEXT NOT NULL,
+    report TEXT NOT NULL,
+    generated_at REAL NOT NULL
+);
+"""
+
+_lock = threading.Lock()
+_stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+_refreshing: set = set()
+_refresh_slots = threading.BoundedSemaphore(max(1, REFRESH_CONCURRENCY))
+_refresher: Optional[Callable[[str, str], Any]] = None
+
+
+def _count(key: str) -> None:
+    with _lock:
+        _stats[key] += 1
+
+
+def stats() -> Dict[str, int]:
+    """Hit/miss/refresh counters since process start."""
+    with _lock:
+        return dict(_stats)
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(re.sub(r"[^\w&+.-]+", " ", name or "").lower().split()).strip(".")
+
+
+def cache_key(company: str, country: str = "") -> str:
+    return json.dumps([normalize_name(company), normalize_name(country)])
+
+
+def set_refresher(fn: Optional[Callable[[str, str], Any]]) -> None:
+    """Register `fn(company, country)` that regenerates (and so re-stores) a report."""
+    global _refresher
+    _refresher = fn
+
+
+def stale_sections(report: Dict[str, Any], generated_at: float, now: Optional[float] = None) -> List[str]:
+    """Sections of `report` that are past their freshness window."""
+    age = (now or time.time()) - generated_at
+    return [s for s, ttl in SECTION_TTLS.items() if s in report and age >= ttl]
+
+
+def lookup(company: str, country: str = "") -> Optional[Dict[str, Any]]:
+    """Return {"report", "generated_at", "stale_sections"} for a servable report, else None."""
+    if not ENABLED:
+        return None
+    try:
+        row = connect("reports", _SCHEMA).execute(
+            "SELECT report, generated_at FROM reports WHERE key = ?", (cache_key(company, country),)
+        ).fetchone()
+    except (sqlite3.Error, OSError):
+        row = None
+    if row is None or time.time() - row[1] >= MAX_AGE:
+        _count("misses")
+        return None
+    report = json.loads(row[0])
+    stale = stale_sections(report, row[1])
+    if stale and _refresher is None:
+        # Nothing can refresh it in the background; regenerate now instead
+        _count("misses")
+        return None
+    _count("stale_hits" if stale else "fresh_hits")
+    return {"report": report, "generated_at": row[1], "stale_sections": stale}
+
+
+def store(company: str, country: str, report: Dict[str, Any]) -> None:
+    """Save a freshly generated report."""
+    if not ENABLED:
+        return
+    try:
+        conn = connect("reports", _SCHEMA)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?)",
+                (cache_key(company, country), company, country, json.dumps(report), time.time()),
+            )
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def _refresh(key: str, company: str, country: str) -> None:
+    try:
+        with _refresh_slots:
+            _refresher(company, country)
+        _count("refreshes")
+    except Exception:  # noqa: BLE001
+        _count("refresh_errors")
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+
+def refresh_in_background(company: str, country: str = "") -> bool:
+    """Start a refresh for the report unless one is already running; True if started."""
+    if _refresher is None:
+        return False
+    key = cache_key(company, country)
+    with _lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+    threading.Thread(target=_refresh, args=(key, company, country), name="report-refresh", daemon=True).start()
+    return True
+
+
+# --- ADK callbacks -----------------------------------------------------------
+
+
+def _is_first_model_call(llm_request: Any) -> bool:
+    # Later calls in the tool loop end with the tool results
+    contents = llm_request.contents or []
+    return bool(contents) and not any(p.function_response for p in contents[-1].parts or [])
+
+
+def _force_refresh(callback_context: Any) -> bool:
+    return bool(callback_context.state.get(FORCE_REFRESH_KEY))
+
+
+def serve_cached_report(callback_context: Any, llm_request: Any) -> Optional[Any]:
+    """ADK before_model_callback: answer from the report cache when possible."""
+    from google.adk.models import LlmResponse
+    from google.genai import types
+
+    if not ENABLED or _force_refresh(callback_context) or not _is_first_model_call(llm_request):
+        return None
+    company, country = parse_company_request(user_text(callback_context.user_content))
+    if not company:
+        return None
+    hit = lookup(company, country)
+    if hit is None:
+        return None
+    if hit["stale_sections"]:
+        refresh_in_background(company, country)
+    text = json.dumps(hit["report"], ensure_ascii=False)
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def store_final_report(callback_context: Any, llm_response: Any) -> Optional[Any]:
+    """ADK after_model_callback: cache the final JSON report of an invocation."""
+    content = llm_response.content
+    if not ENABLED or llm_response.partial or content is None or not content.parts:
+        return None
+    if any(p.function_call for p in content.parts):
+        return None
+    text = "".join(p.text or "" for p in content.parts)
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        report = json.loads(text[start : end + 1]) if 0 <= start < end else None
+    except ValueError:
+        report = None
+    if not isinstance(report, dict) or "company" not in report:
+        return None
+    company, country = parse_company_request(user_text(callback_context.user_content))
+    if company:
+        store(company, country, report)
+    return None
@@ -0,0 +1,371 @@
+"""Rate limiting, retries and circuit breaking per upstream.
+
+Each upstream (DuckDuckGo text search, DuckDuckGo news, every fetched domain)
+gets a token bucket that paces requests, a retry budget that caps retries to a
+fraction of traffic, and a circuit breaker. After BREAKER_FAILURES consecutive
+upstream failures (timeouts, throttling, 5xx) the breaker opens and calls fail
+fast until BREAKER_RESET_SECONDS have passed. Then a single probe decides
+whether to close it again. Client-side errors such as a 404 do not count
+against the upstream.
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from . import deadline
+from .store import connect
+
+T = TypeVar("T")
+
+# Requests per second and burst size for each DuckDuckGo endpoint
+SEARCH_RATE = float(os.environ.get("SEARCH_RATE", "2"))
+SEARCH_BURST = int(os.environ.get("SEARCH_BURST", "6"))
+# Requests per second and burst size for each fetched domain
+FETCH_RATE = float(os.environ.get("FETCH_RATE_PER_DOMAIN", "5"))
+FETCH_BURST = int(os.environ.get("FETCH_BURST_PER_DOMAIN", "10"))
+# Longest a call waits for a rate-limit token before failing fast
+MAX_WAIT = float(os.environ.get("RATE_LIMIT_MAX_WAIT", "10"))
+
+# Retries per call, full-jitter exponential backoff, and the retry budget
+# (retries allowed per call made, plus a small reserve)
+RETRIES = int(os.environ.get("UPSTREAM_RETRIES", "2"))
+BACKOFF_BASE = float(os.environ.get("UPSTREAM_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.environ.get("UPSTREAM_BACKOFF_MAX", "8"))
+RETRY_BUDGET_RATIO = float(os.environ.get("UPSTREAM_RETRY_BUDGET", "0.2"))
+RETRY_BUDGET_RESERVE = 10.0
+
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.environ.get("BREAKER_RESET_SECONDS", "30"))
+
+# Every fetched domain gets an Upstream. Ones unused for UPSTREAM_IDLE_TTL
+# seconds are forgotten, as are the least recently used beyond
+# UPSTREAM_MAX_TRACKED (unless their breaker is open).
+IDLE_TTL = float(os.environ.get("UPSTREAM_IDLE_TTL", "600"))
+MAX_TRACKED = int(os.environ.get("UPSTREAM_MAX_TRACKED", "1024"))
+
+
+class UpstreamUnavailable(Exception):
+    """Raised without calling the upstream: its breaker is open or it is rate limited."""
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate` tokens per second."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, max_wait: float) -> bool:
+        """Take one token, waiting up to `max_wait` seconds; False if none came in time."""
+        if self.rate <= 0:
+            return True
+        deadline = time.monotonic() + max_wait
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class CircuitBreaker:
+    """closed -> open after `threshold` consecutive failures -> half_open after `reset` seconds."""
+
+    def __init__(self, threshold: int, reset: float):
+        self.threshold = threshold
+        self.reset = reset
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset:
+                    return False
+                self.state = "half_open"
+            if self.state == "half_open":
+                # One probe at a time decides whether the upstream has recovered
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                self.state = "open"
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self) -> None:
+        """Give back a half-open probe slot that was never used."""
+        with self._lock:
+            self._probing = False
+
+    def retry_in(self) -> float:
+        with self._lock:
+            if self.state != "open":
+                return 0.0
+            return max(0.0, self.reset - (time.monotonic() - self.opened_at))
+
+
+class Upstream:
+    """Rate limiter, retry budget and breaker for one upstream."""
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(BREAKER_FAILURES, BREAKER_RESET_SECONDS)
+        self._lock = threading.Lock()
+        self._retry_tokens = RETRY_BUDGET_RESERVE
+        self.counts = {"calls": 0, "failures": 0, "retries": 0, "rejected": 0}
+        self.last_used = time.monotonic()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def _deposit(self) -> None:
+        with self._lock:
+            self.counts["calls"] += 1
+            self._retry_tokens = min(RETRY_BUDGET_RESERVE, self._retry_tokens + RETRY_BUDGET_RATIO)
+
+    def _withdraw(self) -> bool:
+        with self._lock:
+            if self._retry_tokens < 1:
+                return False
+            self._retry_tokens -= 1
+            self.counts["retries"] += 1
+            return True
+
+    def _admit(self) -> None:
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise UpstreamUnavailable(
+                f"{self.name} is unavailable (circuit open, retry in {self.breaker.retry_in():.0f}s)"
+            )
+        if not self.bucket.acquire(deadline.clamp(MAX_WAIT)):
+            self._count("rejected")
+            self.breaker.release()
+            raise UpstreamUnavailable(f"{self.name} is rate limited")
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        retryable: Callable[[BaseException], bool],
+        client_error: Callable[[BaseException], bool],
+    ) -> T:
+        """Run `fn` under the limiter and breaker, retrying failures `retryable` accepts.
+
+        Other errors count as the upstream answering only when `client_error`
+        says the request itself was bad; anything else leaves the breaker as it was.
+        """
+        attempt = 0
+        self.last_used = time.monotonic()
+        while True:
+            # Out of report budget: fail before queueing for a token
+            deadline.check(self.name.split(":")[0])
+            self._admit()
+            self._deposit()
+            try:
+                result = fn()
+            except Exception as e:  # noqa: BLE001
+                if not retryable(e):
+                    if client_error(e):
+                        # The upstream answered; the request itself was bad
+                        self.breaker.record_success()
+                    else:
+                        self.breaker.release()
+                    raise
+                self._count("failures")
+                self.breaker.record_failure()
+                if attempt >= RETRIES or self.breaker.state != "closed" or not self._withdraw():
+                    raise
+                attempt += 1
+                # Full jitter keeps retries from many callers from synchronizing
+                pause = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt))
+                if deadline.clamp(pause) < pause:
+                    # The retry could not finish within the report deadline
+                    raise
+                time.sleep(pause)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self.counts)
+            retry_tokens = self._retry_tokens
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retry_in_seconds": round(self.breaker.retry_in(), 1),
+            "tokens": round(self.bucket.tokens, 2),
+            "rate": self.bucket.rate,
+            "burst": self.bucket.burst,
+            "retry_budget": round(retry_tokens, 2),
+            **counts,
+        }
+
+
+_upstreams: "OrderedDict[str, Upstream]" = OrderedDict()
+_upstreams_lock = threading.Lock()
+# Event counts of forgotten upstreams, per kind ("fetch", "ddg"), so totals never go down
+_retired: Dict[str, Dict[str, int]] = {}
+
+
+def _retire(name: str, up: Upstream) -> None:
+    """Fold a forgotten upstream's event counts into its kind's totals; caller holds _upstreams_lock."""
+    retired = _retired.setdefault(name.split(":")[0], dict.fromkeys(up.counts, 0))
+    for event, n in up.snapshot().items():
+        if event in retired:
+            retired[event] += n
+
+
+def _evict_idle() -> None:
+    """Forget idle upstreams and make room for one more (oldest first); caller holds _upstreams_lock."""
+    now = time.monotonic()
+    for name in list(_upstreams):
+        up = _upstreams[name]
+        idle = now - up.last_used >= IDLE_TTL
+        if not idle and len(_upstreams) < MAX_TRACKED:
+            break
+        if idle or up.breaker.state == "closed":
+            del _upstreams[name]
+            _retire(name, up)
+
+
+def upstream(name: str, rate: float, burst: int) -> Upstream:
+    """Return the process-wide Upstream called `name`, creating it on first use."""
+    _apply_resets()
+    with _upstreams_lock:
+        up = _upstreams.get(name)
+        if up is None:
+            _evict_idle()
+            up = _upstreams[name] = Upstream(name, rate, burst)
+        else:
+            _upstreams.move_to_end(name)
+    return up
+
+
+def search_upstream(kind: str) -> Upstream:
+    """Upstream for DuckDuckGo `kind` ("text" or "news") searches."""
+    return upstream(f"ddg:{kind}", SEARCH_RATE, SEARCH_BURST)
+
+
+def fetch_upstream(url: str) -> Upstream:
+    """Upstream for the domain serving `url` (www. and m. prefixes are folded)."""
+    host = (urlsplit(url).hostname or "").lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix) :]
+            break
+    return upstream(f"fetch:{host}", FETCH_RATE, FETCH_BURST)
+
+
+def retired() -> Dict[str, Dict[str, int]]:
+    """Summed event counts of upstreams forgotten after going idle or a reset, per kind ("fetch", "ddg")."""
+    with _upstreams_lock:
+        return {kind: dict(counts) for kind, counts in _retired.items()}
+
+
+def snapshot() -> Dict[str, Dict[str, Any]]:
+    """Limiter and breaker state of every upstream currently tracked by this process."""
+    _apply_resets(force=True)
+    with _upstreams_lock:
+        items = list(_upstreams.items())
+    return {name: up.snapshot() for name, up in sorted(items)}
+
+
+def _forget(name: Optional[str]) -> None:
+    # A reset clears limiter and breaker state, but the exported counters must not go down
+    with _upstreams_lock:
+        for forgotten in list(_upstreams) if name is None else [name]:
+            up = _upstreams.pop(forgotten, None)
+            if up is not None:
+                _retire(forgotten, up)
+
+
+# Resets reach every server worker through the cache directory: each process
+# applies the ones it has not seen yet, checking at most once per second
+_RESET_SCHEMA = """
+CREATE TABLE IF NOT EXISTS upstream_resets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT,
+    at REAL NOT NULL
+);
+"""
+RESET_POLL_SECONDS = 1.0
+_reset_lock = threading.Lock()
+_reset_seen: Optional[int] = None
+_reset_checked = 0.0
+
+
+def _apply_resets(force: bool = False) -> None:
+    global _reset_seen, _reset_checked
+    if not force and time.monotonic() - _reset_checked < RESET_POLL_SECONDS:
+        return
+    with _reset_lock:
+        _reset_checked = time.monotonic()
+        try:
+            conn = connect("control", _RESET_SCHEMA)
+            if _reset_seen is None:
+                # A new process starts clean; only later resets concern it
+                _reset_seen = conn.execute("SELECT COALESCE(MAX(id), 0) FROM upstream_resets").fetchone()[0]
+                return
+            rows = conn.execute(
+                "SELECT id, name FROM upstream_resets WHERE id > ? ORDER BY id", (_reset_seen,)
+            ).fetchall()
+        except (sqlite3.Error, OSError):
+            return
+        for reset_id, name in rows:
+            _forget(name)
+            _reset_seen = reset_id
+
+
+def reset(name: Optional[str] = None) -> None:
+    """Forget the state of one upstream (or all) in every worker, e.g. after an incident is resolved."""
+    _apply_resets(force=True)
+    try:
+        conn = connect("control", _RESET_SCHEMA)
+        with conn:
+            conn.execute("INSERT INTO upstream_resets (name, at) VALUES (?, ?)", (name, time.time()))
+            conn.execute("DELETE FROM upstream_resets WHERE at < ?", (time.time() - 3600,))
+    except (sqlite3.Error, OSError):
+        pass
+    _forget(name)
+    _apply_resets(force=True)
@@ -1,10 +1,56 @@
-from typing import Any, Dict, List
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-from duckduckgo_search import DDGS
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from duckduckgo_search.exceptions import DuckDuckGoSearchException
 
+from . import ddgs_pool, deadline, hedge, metrics, offload, page_cache, search_cache, singleflight
+from .concurrency import parallel_map
+from .context import memoize
+from .extract import extract_html, new_extractor
+from .http_client import get_client, host_slot
+from .metrics import instrument
+from .resilience import fetch_upstream, search_upstream
+from .urls import canonical_url, dedupe_urls, url_key
 
+# Hard cap on bytes read per page, whatever the extracted text length
+FETCH_MAX_BYTES = int(os.environ.get("FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+_TEXTUAL_TYPES = frozenset(["application/xhtml+xml", "application/xml", "application/json", "application/javascript"])
+# Statuses that mean the upstream is throttling or unhealthy, not that the URL is bad
+_RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+def _search_error(exc: BaseException) -> BaseException:
+    """The backend error behind `exc`; DDGS.text() re-raises it wrapped in a plain DuckDuckGoSearchException."""
+    if exc.args and isinstance(exc.args[0], BaseException):
+        return exc.args[0]
+    return exc.__cause__ or exc
+
+
+def _search_retryable(exc: BaseException) -> bool:
+    # Throttling and timeouts, but also connection failures and unexpected
+    # statuses: DDGS raises its base exception for all of them
+    return isinstance(_search_error(exc), DuckDuckGoSearchException)
+
+
+def _search_client_error(exc: BaseException) -> bool:
+    # DDGS asserts a non-empty query before sending anything
+    return isinstance(_search_error(exc), AssertionError)
+
+
+def _fetch_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in _RETRY_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+
+def _fetch_client_error(exc: BaseException) -> bool:
+    # 4xx other than throttling: the URL is bad, the server is fine
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code < 500
+
+
+@instrument
 def web_search(
     query: str,
     max_results: int = 5,
@@ -16,30 +62,53 @@ def web_search(
 
     Returns a list of results with title, href, snippet, and source.
     """
+    key = search_cache.cache_key("web", query, region, safesearch, timelimit)
+    # Identical searches within one report (or batch) share a single request
+    return memoize(
+        ("web", key, max_results),
+        lambda: _web_search(key, query, max_results, region, safesearch, timelimit),
+    )
+
+
+def _web_search(key: str, query: str, max_results: int, region: str, safesearch: str, timelimit: str) -> Dict[str, Any]:
+    cached = search_cache.get("web", key, max_results)
+    if cached is not None:
+        return {"status": "success", "data": cached}
     try:
-        results: List[Dict[str, Any]] = []
-        with DDGS() as ddgs:
-            tl = None if not timelimit else timelimit
-            for r in ddgs.text(
-                query,
-                region=region,
-                safesearch=safesearch,
-                timelimit=tl,
-                max_results=max_results,
-            ):
-                results.append(
-                    {
-                        "title": r.get("title"),
-                        "href": r.get("href"),
-                        "snippet": r.get("body"),
-                        "source": r.get("source"),
-                    }
-                )
+        results = search_upstream("text").call(
+            lambda: _ddgs_text(query, max_results, region, safesearch, timelimit),
+            _search_retryable,
+            _search_client_error,
+        )
+        search_cache.put(key, max_results, results)
         return {"status": "success", "data": results}
     except Exception as e:  # noqa: BLE001
         return {"status": "error", "error_message": f"Search failed: {e}"}
 
 
+def _ddgs_text(query: str, max_results: int, region: str, safesearch: str, timelimit: str) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    with ddgs_pool.lease() as ddgs:
+        tl = None if not timelimit else timelimit
+        for r in ddgs.text(
+            query,
+            region=region,
+            safesearch=safesearch,
+            timelimit=tl,
+            max_results=max_results,
+        ):
+            results.append(
+                {
+                    "title": r.get("title"),
+                    "href": r.get("href"),
+                    "snippet": r.get("body"),
+                    "source": r.get("source"),
+                }
+            )
+    return results
+
+
+@instrument
 def news_search(
     query: str,
     max_results: int = 5,
@@ -51,68 +120,262 @@ def news_search(
 
     Returns a list of news items with title, url, date, and source.
     """
+    key = search_cache.cache_key("news", query, region, safesearch, timelimit)
+    # Identical searches within one report (or batch) share a single request
+    return memoize(
+        ("news", key, max_results),
+        lambda: _news_search(key, query, max_results, region, safesearch, timelimit),
+    )
+
+
+def _news_search(key: str, query: str, max_results: int, region: str, safesearch: str, timelimit: str) -> Dict[str, Any]:
+    cached = search_cache.get("news", key, max_results)
+    if cached is not None:
+        return {"status": "success", "data": cached}
     try:
-        results: List[Dict[str, Any]] = []
-        with DDGS() as ddgs:
-            tl = None if not timelimit else timelimit
-            for r in ddgs.news(
-                query,
-                region=region,
-                safesearch=safesearch,
-                timelimit=tl,
-                max_results=max_results,
-            ):
-                # duckduckgo_search news keys: title, date, source, url
-                results.append(
-                    {
-                        "title": r.get("title"),
-                        "url": r.get("url") or r.get("href"),
-                        "date": r.get("date"),
-                        "source": r.get("source"),
-                    }
-                )
+        results = search_upstream("news").call(
+            lambda: _ddgs_news(query, max_results, region, safesearch, timelimit),
+            _search_retryable,
+            _search_client_error,
+        )
+        search_cache.put(key, max_results, results)
         return {"status": "success", "data": results}
     except Exception as e:  # noqa: BLE001
         return {"status": "error", "error_message": f"News search failed: {e}"}
 
 
-def fetch_url(url: str, max_chars: int = 12000, timeout: int = 12) -> Dict[str, Any]:
+def _ddgs_news(query: str, max_results: int, region: str, safesearch: str, timelimit: str) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    with ddgs_pool.lease() as ddgs:
+        tl = None if not timelimit else timelimit
+        for r in ddgs.news(
+            query,
+            region=region,
+            safesearch=safesearch,
+            timelimit=tl,
+            max_results=max_results,
+        ):
+            # duckduckgo_search news keys: title, date, source, url
+            results.append(
+                {
+                    "title": r.get("title"),
+                    "url": r.get("url") or r.get("href"),
+                    "date": r.get("date"),
+                    "source": r.get("source"),
+                }
+            )
+    return results
+
+
+def _is_textual(content_type: str) -> bool:
+    """True for content types worth extracting text from (missing header counts as text)."""
+    mime = content_type.split(";")[0].strip()
+    return not mime or mime.startswith("text/") or mime in _TEXTUAL_TYPES or mime.endswith(("+xml", "+json"))
+
+
+def _read_body(resp: Any, max_chars: int) -> Tuple[Optional[str], str, bool]:
+    """Stream the response body and return (title, text, truncated).
+
+    Reading stops at FETCH_MAX_BYTES, or as soon as an incremental extractor
+    backend has produced max_chars of text. HTML is parsed inline while it
+    streams in. When a body reaches PARSE_OFFLOAD_MIN_BYTES without yielding
+    max_chars of text, the inline parser stops there. Its text density sizes
+    the rest of the read, and the whole body is then parsed once in the
+    parse pool. Only those first bytes are parsed twice, and only for pages
+    that large.
+    """
+    content_type = (resp.headers.get("content-type") or "").lower()
+    is_html: Optional[bool] = None
+    extractor: Optional[Any] = None
+    raw: List[bytes] = []
+    received = 0
+    read_limit = FETCH_MAX_BYTES
+    offloading = False
+    stopped_short = False
+    for chunk in resp.iter_bytes():
+        if is_html is None:
+            # Heuristic: treat as HTML if header says so or content looks like HTML
+            is_html = "text/html" in content_type or b"<html" in chunk[:200].lower()
+            if is_html:
+                extractor = new_extractor(max_chars, encoding=resp.charset_encoding)
+        received += len(chunk)
+        if received > read_limit:
+            chunk = chunk[: len(chunk) - (received - read_limit)]
+            stopped_short = True
+        if not is_html or offload.enabled():
+            raw.append(chunk)
+        if is_html and not offloading:
+            extractor.feed(chunk)
+            if extractor.done:
+                break
+            if offload.enabled() and received >= offload.MIN_BYTES and not stopped_short:
+                # Too big to parse on the request thread. Size the rest of the
+                # read from the text density seen so far, then parse out of process.
+                offloading = True
+                chars = getattr(extractor, "chars", 0)
+                if chars:
+                    read_limit = min(read_limit, int(received * max_chars / chars * 1.25))
+        elif not is_html and received >= max_chars * 4:
+            # ~4 bytes per character is enough for any text encoding
+            break
+        if stopped_short or received >= read_limit:
+            stopped_short = True
+            break
+
+    metrics.inc("research_fetch_bytes_total", {"domain": metrics.domain_label(str(resp.url))}, received)
+    if is_html and offloading:
+        metrics.inc("research_pages_parsed_total", {"mode": "offloaded"})
+        title, text, truncated = offload.run_cpu(extract_html, b"".join(raw), max_chars, resp.charset_encoding)
+        return title, text, truncated or stopped_short
+    if is_html:
+        metrics.inc("research_pages_parsed_total", {"mode": "inline"})
+        title, text, truncated = extractor.result()
+        return title, text, truncated or stopped_short
+    # Non-HTML: return as text
+    text = b"".join(raw).decode(resp.charset_encoding or "utf-8", errors="replace")
+    return None, text[:max_chars], len(text) > max_chars or stopped_short
+
+
+@instrument
+def fetch_url(url: str, max_chars: int = 12000, timeout: int = 12, use_cache: bool = True) -> Dict[str, Any]:
     """Fetch and extract readable text content from a URL.
 
     - Truncates content to max_chars
     - Returns page title when available
+    - Serves from the on-disk page cache unless use_cache is False
     """
+    if not use_cache:
+        return _fetch_url(url, max_chars, timeout, use_cache)
+    # Within one report, each document is fetched once and shared by every tool;
+    # across reports, concurrent fetches of one document share a single request.
+    # An unparseable URL keys on its raw spelling; _fetch_url reports the error.
+    key = ("page", url_key(url), max_chars)
+    return memoize(key, lambda: singleflight.do(key, lambda: _fetch_url(url, max_chars, timeout, use_cache)))
+
+
+def _fetch_url(url: str, max_chars: int, timeout: int, use_cache: bool) -> Dict[str, Any]:
     try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
-            )
-        }
-        resp = requests.get(url, headers=headers, timeout=timeout)
-        resp.raise_for_status()
+        key = canonical_url(url)
+        cached = page_cache.lookup(key, max_chars) if use_cache else None
+        if cached and cached["fresh"]:
+            return {"status": "success", "data": {"url": url, "title": cached["title"], "content": cached["content"]}}
 
-        content_type = (resp.headers.get("content-type") or "").lower()
-        text = resp.text
-
-        # Heuristic: treat as HTML if header says so or content looks like HTML
-        is_html = "text/html" in content_type or "<html" in text[:200].lower()
-
-        if is_html:
-            soup = BeautifulSoup(text, "lxml")
-            for tag in soup(["script", "style", "noscript", "svg", "canvas"]):
-                tag.decompose()
-            title = None
-            if soup.title and soup.title.string:
-                title = soup.title.string.strip()
-            raw_text = soup.get_text(separator="\n")
-            lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
-            joined = "\n".join(lines)
-            content = joined[:max_chars]
-            return {"status": "success", "data": {"url": url, "title": title, "content": content}}
-        # Non-HTML: return as text
-        return {"status": "success", "data": {"url": url, "title": None, "content": text[:max_chars]}}
+        headers: Dict[str, str] = {}
+        if cached:
+            # Stale entry: ask the server whether it changed
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        # Paced, retried and circuit-broken per domain
+        return fetch_upstream(url).call(
+            lambda: _fetch_once(url, key, cached, headers, max_chars, timeout),
+            _fetch_retryable,
+            _fetch_client_error,
+        )
     except Exception as e:  # noqa: BLE001
         return {"status": "error", "error_message": f"Failed to fetch {url}: {e}"}
 
 
+def _fetch_once(
+    url: str, key: str, cached: Optional[Dict[str, Any]], headers: Dict[str, str], max_chars: int, timeout: int
+) -> Dict[str, Any]:
+    domain = metrics.domain_label(url)
+    started = time.perf_counter()
+    # Shared keep-alive pool; at most HTTP_PER_HOST_LIMIT requests per host at once.
+    # The body is streamed so large pages are never fully downloaded, and the
+    # timeout never runs past the report deadline.
+    with host_slot(url), get_client().stream("GET", url, headers=headers, timeout=deadline.clamp(timeout)) as resp:
+        metrics.inc("research_fetch_requests_total", {"domain": domain, "status": f"{resp.status_code // 100}xx"})
+        if cached and resp.status_code == 304:
+            page_cache.revalidated(key)
+            return {"status": "success", "data": {"url": url, "title": cached["title"], "content": cached["content"]}}
+        resp.raise_for_status()
+        content_type = (resp.headers.get("content-type") or "").lower()
+        # Reject binary payloads (PDFs, images, archives) before reading the body
+        if not _is_textual(content_type):
+            return {"status": "error", "error_message": f"Failed to fetch {url}: unsupported content type {content_type}"}
+        title, content, truncated = _read_body(resp, max_chars)
+    elapsed = time.perf_counter() - started
+    metrics.observe("research_fetch_duration_seconds", elapsed, {"domain": domain})
+    hedge.record(elapsed)
+    page_cache.store(
+        key,
+        title,
+        content,
+        truncated=truncated,
+        etag=resp.headers.get("etag"),
+        last_modified=resp.headers.get("last-modified"),
+    )
+    return {"status": "success", "data": {"url": url, "title": title, "content": content}}
+
+
+def web_search_many(queries: List[str], max_results: int = 5) -> List[Dict[str, Any]]:
+    """Run several web searches concurrently; results are returned in query order."""
+    return parallel_map(lambda q: web_search(q, max_results=max_results), queries)
+
+
+def result_hrefs(results: List[Dict[str, Any]], per_query: int) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Hrefs of the first `per_query` results of each web search, in order.
+
+    The search's remaining results are returned as each href's alternates for
+    fetch_many to hedge with.
+    """
+    hrefs: List[str] = []
+    alternates: Dict[str, List[str]] = {}
+    for res in results:
+        if res.get("status") != "success":
+            continue
+        data = res.get("data", [])
+        spares = [r.get("href") for r in data[per_query:] if r.get("href")]
+        for r in data[:per_query]:
+            href = r.get("href")
+            if href:
+                hrefs.append(href)
+                alternates.setdefault(href, spares)
+    return hrefs, alternates
+
+
+def fetch_many(
+    urls: List[str],
+    max_chars: int = 12000,
+    timeout: int = 12,
+    alternates: Optional[Dict[str, List[str]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch several URLs concurrently, each distinct document once.
+
+    URLs that differ only in tracking params, mobile/AMP host or path are fetched
+    once (see canonical_url). Returns a mapping url -> fetch_url result for every
+    input URL so callers can walk their own ordered (possibly duplicated) URL
+    lists deterministically.
+
+    A URL still loading past the hedge delay is raced against the next of its
+    `alternates` (see tools.hedge); an alternate that wins is added to the
+    mapping right after the URL it stood in for, so walking the mapping's items
+    visits it in place, and the URL it replaced gets an error result. So do URLs
+    unfinished when the report deadline nears.
+    """
+    unique = dedupe_urls(urls)
+    first = {url_key(u): u for u in unique}
+    spares: Dict[str, List[str]] = {}
+    for url, alts in (alternates or {}).items():
+        slot = first.get(url_key(url))
+        if slot is not None:
+            spares.setdefault(slot, []).extend(a for a in dedupe_urls(alts) if url_key(a) not in first)
+    results, winners = hedge.gather(lambda u: fetch_url(u, max_chars=max_chars, timeout=timeout), unique, spares)
+
+    pages: Dict[str, Dict[str, Any]] = {}
+    for u in urls:
+        if not u:
+            continue
+        slot = first[url_key(u)]
+        alt = winners.get(slot)
+        # A primary that lost the race counts as failed even if it finished
+        # too, so its page is neither read nor reported next to the alternate's
+        result = None if alt else results.get(slot)
+        reason = f"an alternate answered first ({alt})" if alt else "report deadline reached before it finished"
+        pages[u] = result or {"status": "error", "error_message": f"Failed to fetch {u}: {reason}"}
+        if alt:
+            pages.setdefault(alt, results[alt])
+    return pages
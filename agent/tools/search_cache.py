@@ -0,0 +1,128 @@
+"""Result cache for web_search / news_search.
+
+Keys are normalized (kind, query, region, safesearch, timelimit) so queries that
+differ only by case or whitespace share an entry. An entry fetched with a larger
+max_results also serves smaller requests. A small in-memory LRU sits in front of
+the SQLite store.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .store import connect
+
+ENABLED = os.environ.get("SEARCH_CACHE", "1").lower() in ("1", "true", "yes")
+MEMORY_ENTRIES = int(os.environ.get("SEARCH_CACHE_MEMORY_ENTRIES", "512"))
+
+# Freshness per search kind, in seconds
+TTLS: Dict[str, int] = {
+    "web": int(os.environ.get("SEARCH_CACHE_TTL_WEB", str(24 * 3600))),
+    "news": int(os.environ.get("SEARCH_CACHE_TTL_NEWS", str(30 * 60))),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    key TEXT PRIMARY KEY,
+    max_results INTEGER NOT NULL,
+    results TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# key -> (max_results, results, fetched_at)
+_Entry = Tuple[int, List[Dict[str, Any]], float]
+
+_lock = threading.Lock()
+_memory: "OrderedDict[str, _Entry]" = OrderedDict()
+_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+
+def _count(key: str) -> None:
+    with _lock:
+        _stats[key] += 1
+
+
+def stats() -> Dict[str, int]:
+    """Hit/miss counters since process start."""
+    with _lock:
+        return dict(_stats)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.split()).lower()
+
+
+def cache_key(kind: str, query: str, region: str, safesearch: str, timelimit: str) -> str:
+    return json.dumps([kind, normalize_query(query), region.lower(), safesearch.lower(), timelimit or ""])
+
+
+def _serve(entry: _Entry, kind: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+    stored_max, results, fetched_at = entry
+    if time.time() - fetched_at >= TTLS[kind]:
+        return None
+    # A smaller request is a prefix of a larger one; a short result set means
+    # the backend had nothing more to give, so it covers any size.
+    if max_results <= stored_max or len(results) < stored_max:
+        return results[:max_results]
+    return None
+
+
+def _remember(key: str, entry: _Entry) -> None:
+    with _lock:
+        _memory[key] = entry
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def get(kind: str, key: str, max_results: int) -> Optional[List[Dict[str, Any]]]:
+    """Return cached results for `key` if a fresh entry covers `max_results`."""
+    if not ENABLED:
+        return None
+    with _lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            _memory.move_to_end(key)
+    if entry is not None:
+        served = _serve(entry, kind, max_results)
+        if served is not None:
+            _count("memory_hits")
+            return served
+
+    try:
+        row = connect("searches", _SCHEMA).execute(
+            "SELECT max_results, results, fetched_at FROM searches WHERE key = ?", (key,)
+        ).fetchone()
+    except (sqlite3.Error, OSError):
+        row = None
+    if row is not None:
+        entry = (row[0], json.loads(row[1]), row[2])
+        served = _serve(entry, kind, max_results)
+        if served is not None:
+            _remember(key, entry)
+            _count("disk_hits")
+            return served
+    _count("misses")
+    return None
+
+
+def put(key: str, max_results: int, results: List[Dict[str, Any]]) -> None:
+    """Store a fresh result set in memory and on disk."""
+    if not ENABLED:
+        return
+    entry = (max_results, results, time.time())
+    _remember(key, entry)
+    try:
+        conn = connect("searches", _SCHEMA)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?)",
+                (key, max_results, json.dumps(results), entry[2]),
+            )
+    except (sqlite3.Error, OSError):
+        pass
@@ -0,0 +1,71 @@
+"""Report sections built directly from tool outputs, without the model.
+
+Each section of the report schema (see OUTPUT_SPEC in agent.py) maps to the
+prefetch jobs that feed it. `section_jobs` returns one callable per section that
+runs those jobs and shapes their output into the schema, so a section can be
+streamed as soon as its own tools finish.
+"""
+
+from typing import Any, Callable, Dict, List
+
+from .concurrency import run_parallel
+from .prefetch import research_jobs
+
+SECTIONS = ("company", "founders_leadership", "competitors", "funding", "web_traffic", "news")
+
+_COMPANY_FIELDS = (
+    "name", "website", "sector", "industry", "hq", "founded_year", "type", "employees", "ticker",
+    "market_cap", "annual_revenue", "linkedin_url", "twitter_url", "tagline",
+)
+
+
+def _data(res: Dict[str, Any]) -> Any:
+    if res.get("status") != "success":
+        raise RuntimeError(res.get("error_message") or "tool failed")
+    return res.get("data") or {}
+
+
+def _company(overview_res: Dict[str, Any], ticker_res: Dict[str, Any]) -> Dict[str, Any]:
+    overview = _data(overview_res).get("overview", {})
+    section: Dict[str, Any] = {field: overview.get(field) for field in _COMPANY_FIELDS}
+    # The ticker is optional enrichment; a failed lookup leaves the fields null
+    if ticker_res.get("status") == "success":
+        ticker = ticker_res.get("data") or {}
+        section["ticker"] = ticker.get("ticker")
+        financials = ((ticker.get("financials") or {}).get("data") or {}).get("financials") or {}
+        section["market_cap"] = financials.get("market_cap")
+        section["annual_revenue"] = financials.get("annual_revenue")
+    return section
+
+
+def _news(res: Dict[str, Any]) -> Dict[str, Any]:
+    items: List[Dict[str, Any]] = [
+        {"title": r.get("title") or "", "url": r.get("url") or "", "date": r.get("date"), "source": r.get("source")}
+        for r in _data(res)
+    ]
+    return {"items": items, "sources": list(dict.fromkeys(i["url"] for i in items if i["url"]))}
+
+
+def section_jobs(company: str, country: str = "") -> Dict[str, Callable[[], Dict[str, Any]]]:
+    """Zero-argument callables returning each report section; they raise if the section's tool failed."""
+    jobs = research_jobs(company, country)
+
+    def company_section() -> Dict[str, Any]:
+        return _company(*run_parallel(jobs["overview"], jobs["ticker"]))
+
+    def leadership_section() -> Dict[str, Any]:
+        data = _data(jobs["leadership"]())
+        return {"people": data.get("people", []), "sources": data.get("sources", [])}
+
+    def competitors_section() -> Dict[str, Any]:
+        data = _data(jobs["competitors"]())
+        return {"list": data.get("competitors", []), "sources": data.get("sources", [])}
+
+    return {
+        "company": company_section,
+        "founders_leadership": leadership_section,
+        "competitors": competitors_section,
+        "funding": lambda: _data(jobs["funding"]()).get("funding", {}),
+        "web_traffic": lambda: _data(jobs["web_traffic"]()).get("web_traffic", {}),
+        "news": lambda: _news(jobs["news"]()),
+    }
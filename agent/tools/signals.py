@@ -0,0 +1,203 @@
+"""Heuristic extraction from page text.
+
+Keyword sets and regexes are prepared once at import time. Each document is
+lowercased once per scan, and every keyword is located with str.find (C speed)
+rather than re-lowercasing and re-searching per keyword and call site; a scan
+returns every keyword hit with its offset.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class KeywordScanner:
+    """Finds every occurrence of a fixed keyword set in a text."""
+
+    def __init__(self, keywords: Iterable[str], ignore_case: bool = False):
+        self.keywords: List[str] = list(dict.fromkeys(keywords))
+        self.ignore_case = ignore_case
+        self._needles = [kw.lower() if ignore_case else kw for kw in self.keywords]
+
+    def _haystack(self, text: str) -> str:
+        if not self.ignore_case:
+            return text
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered
+        # Some characters lowercase to several code points; keep offsets aligned
+        return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+    def scan(self, text: str) -> List[Tuple[int, str]]:
+        """Return every (offset, keyword) hit, overlapping ones included, by offset."""
+        haystack = self._haystack(text)
+        hits: List[Tuple[int, str]] = []
+        for kw, needle in zip(self.keywords, self._needles):
+            i = haystack.find(needle)
+            while i >= 0:
+                hits.append((i, kw))
+                i = haystack.find(needle, i + 1)
+        hits.sort(key=lambda h: h[0])
+        return hits
+
+    def first_hits(self, text: str) -> Dict[str, int]:
+        """Offset of the first occurrence of each keyword that appears."""
+        haystack = self._haystack(text)
+        first: Dict[str, int] = {}
+        for kw, needle in zip(self.keywords, self._needles):
+            i = haystack.find(needle)
+            if i >= 0:
+                first[kw] = i
+        return first
+
+
+def _any_of(terms: Iterable[str]) -> "re.Pattern[str]":
+    return re.compile("|".join(re.escape(t) for t in terms))
+
+
+def _first_line_value(segment: str) -> str:
+    return segment.split("\n")[0].split(":")[-1].strip()
+
+
+# --- get_company_overview ---------------------------------------------------
+
+_OVERVIEW_LABELS = KeywordScanner(["industry", "headquarters", "headquarter", "head office", "founded"], ignore_case=True)
+
+
+def overview_fields(content: str) -> Dict[str, str]:
+    """Industry / HQ / founded values from the first matching infobox-like lines."""
+    first = _OVERVIEW_LABELS.first_hits(content)
+    fields: Dict[str, str] = {}
+    if "industry" in first:
+        idx = first["industry"]
+        fields["industry"] = _first_line_value(content[idx : idx + 400])
+    for label in ("headquarters", "headquarter", "head office"):
+        if label in first:
+            idx = first[label]
+            fields["hq"] = _first_line_value(content[idx : idx + 200])
+            break
+    if "founded" in first:
+        idx = first["founded"]
+        fields["founded_year"] = _first_line_value(content[idx : idx + 200])
+    return fields
+
+
+# --- get_company_leadership -------------------------------------------------
+
+_LEADERSHIP_ANCHORS = KeywordScanner(
+    ["Founded by", "Founder", "Founders", "Key people", "Chief Executive Officer", "CEO", "CFO", "CTO"]
+)
+_LEADERSHIP_ANCHOR_ORDER = {kw: i for i, kw in enumerate(_LEADERSHIP_ANCHORS.keywords)}
+_WIKI_ROLE_RE = _any_of(["CEO", "CFO", "CTO", "Founder", "founder", "Chief", "President", "Chairman", "Chairwoman"])
+_SITE_ROLE_RE = _any_of(
+    ["CEO", "CFO", "CTO", "COO", "Chief", "Founder", "founder", "VP", "Vice President", "President", "Head of"]
+)
+
+
+def wiki_leadership_lines(content: str, limit: int) -> List[str]:
+    """Role-bearing lines in the 400 chars after each leadership anchor, grouped by anchor."""
+    hits = sorted(_LEADERSHIP_ANCHORS.scan(content), key=lambda h: (_LEADERSHIP_ANCHOR_ORDER[h[1]], h[0]))
+    lines: List[str] = []
+    for offset, _kw in hits:
+        for ln in content[offset : offset + 400].split("\n"):
+            if ln.strip() and _WIKI_ROLE_RE.search(ln):
+                if len(lines) >= limit:
+                    return lines
+                lines.append(ln.strip())
+    return lines
+
+
+def site_leadership_lines(content: str, limit: int) -> List[str]:
+    """Role-bearing lines from a company team/leadership page."""
+    lines: List[str] = []
+    for ln in content.split("\n"):
+        if ln.strip() and _SITE_ROLE_RE.search(ln):
+            if len(lines) >= limit:
+                break
+            lines.append(ln.strip())
+    return lines
+
+
+# --- get_web_traffic_summary ------------------------------------------------
+
+_TRAFFIC_KEYWORDS = KeywordScanner(["visits", "monthly visits", "traffic", "unique visitors"], ignore_case=True)
+
+
+def traffic_snippets(content: str) -> List[str]:
+    """A window around the first mention of each traffic keyword, in keyword order."""
+    first = _TRAFFIC_KEYWORDS.first_hits(content)
+    return [
+        content[max(0, first[kw] - 120) : first[kw] + 180].strip()
+        for kw in _TRAFFIC_KEYWORDS.keywords
+        if kw in first
+    ]
+
+
+# --- get_company_funding_summary --------------------------------------------
+
+_ROUND_MARKERS = ("series", "seed", "pre-seed", "angel", "round", "ipo", "grant")
+_INVESTOR_MARKERS = ("investor", "led by")
+_FUNDING_KEYWORDS = KeywordScanner(_ROUND_MARKERS + _INVESTOR_MARKERS, ignore_case=True)
+_AMOUNT_RE = re.compile(r"\$\s?([0-9.,]+)\s?(million|billion|m|bn|b)?", re.I)
+
+
+def _amount_millions(match: Tuple[str, Optional[str]]) -> float:
+    num, unit = match
+    n = float(num.replace(",", ""))
+    if (unit or "").lower() in ("billion", "bn", "b"):
+        n *= 1_000
+    return n
+
+
+def _densest_window(offsets: List[int], size: int) -> Optional[int]:
+    """Start of the `size`-char window covering the most offsets (earliest on ties)."""
+    best, best_count, lo = None, 0, 0
+    for hi, end in enumerate(offsets):
+        while end - offsets[lo] >= size:
+            lo += 1
+        if hi - lo + 1 > best_count:
+            best, best_count = offsets[lo], hi - lo + 1
+    return best
+
+
+def _snippet(content: str, offsets: List[int], size: int) -> str:
+    start = _densest_window(sorted(offsets), size)
+    if start is None:
+        return ""
+    # Begin a little before the first hit, at a word boundary
+    start = max(0, start - size // 8)
+    if start:
+        space = content.find(" ", start)
+        start = space + 1 if 0 <= space < start + 40 else start
+    return content[start : start + size].strip()
+
+
+def funding_signals(content: str, snippet_chars: int = 0) -> Dict[str, object]:
+    """Round/investor markers and the largest $ amount (USD millions) on a page.
+
+    With `snippet_chars`, also the densest `snippet_chars` window of round
+    markers and amounts (round_snippet) and of investor markers (investor_snippet).
+    """
+    hits = _FUNDING_KEYWORDS.scan(content)
+    found = {kw for _offset, kw in hits}
+    largest: Optional[float] = None
+    amount_offsets: List[int] = []
+    for m in _AMOUNT_RE.finditer(content):
+        try:
+            value = _amount_millions(m.groups())
+        except ValueError:
+            # e.g. "$." or "$1.2.3" in scraped text
+            continue
+        amount_offsets.append(m.start())
+        if largest is None or value > largest:
+            largest = value
+    signals: Dict[str, object] = {
+        "has_round": any(m in found for m in _ROUND_MARKERS),
+        "has_investor": any(m in found for m in _INVESTOR_MARKERS),
+        "largest_amount": largest,
+    }
+    if snippet_chars:
+        round_offsets = [o for o, kw in hits if kw in _ROUND_MARKERS] + amount_offsets
+        investor_offsets = [o for o, kw in hits if kw in _INVESTOR_MARKERS]
+        signals["round_snippet"] = _snippet(content, round_offsets, snippet_chars)
+        signals["investor_snippet"] = _snippet(content, investor_offsets, snippet_chars)
+    return signals
@@ -0,0 +1,69 @@
+"""Process-wide single-flight: concurrent calls for one key share one execution.
+
+The research context memoizes within a report; this shares work across
+reports (parallel reports in a batch, concurrent sessions). The first caller
+for a key runs the function; callers arriving while it runs wait and get the
+same result. Successful results stay shareable for SINGLE_FLIGHT_TTL seconds
+(at most SINGLE_FLIGHT_MAX_ENTRIES of them) so a burst of near-simultaneous
+requests also collapses; errors are never kept.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+TTL = float(os.environ.get("SINGLE_FLIGHT_TTL", "60"))
+MAX_ENTRIES = int(os.environ.get("SINGLE_FLIGHT_MAX_ENTRIES", "256"))
+
+_lock = threading.Lock()
+_inflight: Dict[Hashable, Future] = {}
+# key -> (finished at, result), oldest first
+_recent: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+_stats = {"calls": 0, "shared": 0}
+
+
+def _is_error(result: Any) -> bool:
+    return isinstance(result, dict) and result.get("status") == "error"
+
+
+def do(key: Hashable, fn: Callable[[], Any]) -> Any:
+    """Result of `fn()`, shared with every concurrent (or recent) call for `key`."""
+    with _lock:
+        _stats["calls"] += 1
+        recent = _recent.get(key)
+        if recent is not None and time.monotonic() - recent[0] < TTL:
+            _stats["shared"] += 1
+            return recent[1]
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+        else:
+            _stats["shared"] += 1
+    if not leader:
+        return future.result()
+
+    try:
+        result = fn()
+    except BaseException as e:
+        with _lock:
+            _inflight.pop(key, None)
+        future.set_exception(e)
+        raise
+    with _lock:
+        _inflight.pop(key, None)
+        if TTL > 0 and not _is_error(result):
+            _recent[key] = (time.monotonic(), result)
+            _recent.move_to_end(key)
+            while len(_recent) > MAX_ENTRIES:
+                _recent.popitem(last=False)
+    future.set_result(result)
+    return result
+
+
+def stats() -> Dict[str, int]:
+    with _lock:
+        return {**_stats, "inflight": len(_inflight), "recent": len(_recent)}
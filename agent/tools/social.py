@@ -1,8 +1,12 @@
 from typing import Any, Dict, List
 
-from .search import web_search, fetch_url
+from .concurrency import run_parallel
+from .entities import find_linkedin_url, find_twitter_url
+from .metrics import instrument
+from .search import fetch_url
 
 
+@instrument
 def get_social_followers(company: str) -> Dict[str, Any]:
     """Best-effort snapshot of Twitter/X and LinkedIn followers.
 
@@ -12,35 +16,31 @@ def get_social_followers(company: str) -> Dict[str, Any]:
     twitter = {"value": None, "source": None}
     linkedin = {"value": None, "source": None}
 
+    # Profile URLs are resolved once per report and shared with get_company_overview
+    twitter_url, linkedin_url = run_parallel(
+        lambda: find_twitter_url(company),
+        lambda: find_linkedin_url(company),
+    )
+
     # Twitter/X
-    x_res = web_search(f"{company} official Twitter followers", max_results=5)
-    if x_res.get("status") == "success":
-        for r in x_res.get("data", []):
-            href = r.get("href")
-            if href and ("twitter.com" in href or "x.com" in href):
-                sources.append(href)
-                page = fetch_url(href)
-                if page.get("status") == "success":
-                    content = page.get("data", {}).get("content", "")
-                    # Heuristic to find followers count mentions
-                    for kw in ["Followers", "followers"]:
-                        idx = content.find(kw)
-                        if idx != -1:
-                            window = content[max(0, idx - 50) : idx + 50]
-                            twitter = {"value": window.strip(), "source": href}
-                            break
-                break
+    if twitter_url:
+        sources.append(twitter_url)
+        page = fetch_url(twitter_url)
+        if page.get("status") == "success":
+            content = page.get("data", {}).get("content", "")
+            # Heuristic to find followers count mentions
+            for kw in ["Followers", "followers"]:
+                idx = content.find(kw)
+                if idx != -1:
+                    window = content[max(0, idx - 50) : idx + 50]
+                    twitter = {"value": window.strip(), "source": twitter_url}
+                    break
 
     # LinkedIn
-    li_res = web_search(f"{company} LinkedIn followers", max_results=5)
-    if li_res.get("status") == "success":
-        for r in li_res.get("data", []):
-            href = r.get("href")
-            if href and "linkedin.com/company" in href:
-                sources.append(href)
-                # LinkedIn is often gated; we may not fetch meaningful content
-                linkedin = {"value": None, "source": href}
-                break
+    if linkedin_url:
+        sources.append(linkedin_url)
+        # LinkedIn is often gated; we may not fetch meaningful content
+        linkedin = {"value": None, "source": linkedin_url}
 
     return {
         "status": "success",
@@ -0,0 +1,38 @@
+"""Local SQLite storage shared by the on-disk caches.
+
+Databases run in WAL mode so several server worker processes can share one
+cache directory: readers never block the writer, and writers queue on the
+busy timeout instead of failing with "database is locked".
+"""
+
+import os
+import sqlite3
+import threading
+
+CACHE_DIR = os.environ.get(
+    "RESEARCH_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "company-research")
+)
+
+_local = threading.local()
+
+
+def connect(name: str, schema: str = "") -> sqlite3.Connection:
+    """Return this thread's connection to `<CACHE_DIR>/<name>.sqlite3`.
+
+    `schema` (idempotent DDL) is applied when the connection is first opened.
+    Connections are per thread, so several threads and processes may each hold one.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(name)
+    if conn is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        conn = sqlite3.connect(os.path.join(CACHE_DIR, f"{name}.sqlite3"), timeout=10)
+        # WAL is persistent per database file; NORMAL sync is safe under WAL
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if schema:
+            conn.executescript(schema)
+        conns[name] = conn
+    return conn
@@ -0,0 +1,217 @@
+"""Local index of listed securities for ticker detection without a web search.
+
+Entries (symbol, exchange, name, aliases, country) are loaded once from a CSV:
+the refreshed copy in the cache directory when present, else the small list
+bundled in tools/data/tickers.csv. `refresh()` rebuilds the cached copy from the
+SEC's company_tickers_exchange.json (every US-listed issuer):
+
+    python -m tools.ticker_index refresh      # from the agent/ directory
+
+Names are matched exactly after normalization (case, punctuation and corporate
+suffixes such as "Inc." or "plc" are ignored), then fuzzily by trigram overlap
+(Dice coefficient) using an inverted trigram index.
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+import threading
+from array import array
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .http_client import get_client
+from .store import CACHE_DIR
+
+ENABLED = os.environ.get("TICKER_INDEX", "1").lower() in ("1", "true", "yes")
+# Minimum trigram similarity (0-1) for a fuzzy name match
+MIN_SCORE = float(os.environ.get("TICKER_INDEX_MIN_SCORE", "0.8"))
+BUNDLED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "tickers.csv")
+REFRESHED_PATH = os.environ.get("TICKER_INDEX_PATH", os.path.join(CACHE_DIR, "tickers.csv"))
+SEC_URL = "https://www.sec.gov/files/company_tickers_exchange.json"
+
+_FIELDS = ["symbol", "exchange", "name", "aliases", "country"]
+_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "companies", "ltd", "limited", "llc", "plc",
+    "sa", "se", "ag", "nv", "ab", "asa", "spa", "as", "holdings", "holding", "group", "the", "class", "cl",
+}
+_COUNTRY_ALIASES = {
+    "usa": "us", "united states": "us", "united states of america": "us", "america": "us",
+    "uk": "gb", "united kingdom": "gb", "great britain": "gb", "england": "gb",
+    "china": "cn", "japan": "jp", "germany": "de", "india": "in", "canada": "ca", "france": "fr",
+    "netherlands": "nl", "taiwan": "tw", "singapore": "sg", "ireland": "ie", "denmark": "dk",
+}
+
+
+class Listing(NamedTuple):
+    symbol: str
+    exchange: str
+    name: str
+    country: str
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase words without punctuation or corporate suffixes ("The Coca-Cola Company" -> "coca cola")."""
+    words = re.findall(r"[a-z0-9]+", name.lower().replace("&", " and ").replace("'", ""))
+    core = [w for w in words if w not in _SUFFIXES]
+    return " ".join(core or words)
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _country_code(country: str) -> str:
+    c = country.strip().lower()
+    return _COUNTRY_ALIASES.get(c, c)
+
+
+class TickerIndex:
+    """Listings with an exact-name map and an inverted trigram index over names and aliases."""
+
+    def __init__(self, rows: List[Dict[str, str]]):
+        self.listings: List[Listing] = []
+        # normalized name or alias -> listing ids
+        self.names: Dict[str, List[int]] = {}
+        # trigram -> ids of the spellings (names and aliases) containing it
+        self.grams: Dict[str, array] = {}
+        # spelling id -> its trigram count, and the listing it belongs to
+        self._gram_counts = array("H")
+        self._owner = array("I")
+        for row in rows:
+            symbol = (row.get("symbol") or "").strip().upper()
+            name = (row.get("name") or "").strip()
+            if not symbol or not name:
+                continue
+            idx = len(self.listings)
+            exchange, country = (row.get("exchange") or "").strip(), (row.get("country") or "").strip().lower()
+            self.listings.append(Listing(symbol, exchange, name, country))
+            aliases = [a for a in (row.get("aliases") or "").split("|") if a.strip()]
+            for spelling in dict.fromkeys(normalize_name(n) for n in [name, *aliases]):
+                if not spelling or idx in self.names.get(spelling, ()):
+                    continue
+                self.names.setdefault(spelling, []).append(idx)
+                sid = len(self._gram_counts)
+                grams = _trigrams(spelling)
+                self._gram_counts.append(len(grams))
+                self._owner.append(idx)
+                for g in grams:
+                    self.grams.setdefault(g, array("I")).append(sid)
+
+    def __len__(self) -> int:
+        return len(self.listings)
+
+    def match(self, company: str, country: str = "", min_score: float = MIN_SCORE) -> Optional[Tuple[Listing, float]]:
+        """Best listing for `company` with its similarity score, or None below `min_score`.
+
+        A listing from another country than `country` (when both are known) never
+        matches, so callers fall back to a search instead of trusting the index.
+        """
+        query = normalize_name(company)
+        if not query:
+            return None
+        wanted = _country_code(country) if country else ""
+
+        def eligible(idx: int) -> bool:
+            home = self.listings[idx].country
+            return not (wanted and home and home != wanted)
+
+        candidates: Dict[int, float] = {idx: 1.0 for idx in self.names.get(query, []) if eligible(idx)}
+        if not candidates:
+            grams = _trigrams(query)
+            shared: Dict[int, int] = {}
+            for g in grams:
+                for sid in self.grams.get(g, ()):
+                    shared[sid] = shared.get(sid, 0) + 1
+            for sid, n in shared.items():
+                idx = self._owner[sid]
+                if not eligible(idx):
+                    continue
+                score = 2 * n / (len(grams) + self._gram_counts[sid])
+                candidates[idx] = max(candidates.get(idx, 0.0), score)
+        if not candidates:
+            return None
+        idx, score = max(candidates.items(), key=lambda item: item[1])
+        return (self.listings[idx], round(score, 3)) if score >= min_score else None
+
+
+_lock = threading.Lock()
+_index: Optional[TickerIndex] = None
+
+
+def _read(path: str) -> List[Dict[str, str]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def get_index() -> TickerIndex:
+    """The process-wide index, loaded on first use."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                path = REFRESHED_PATH if os.path.exists(REFRESHED_PATH) else BUNDLED_PATH
+                _index = TickerIndex(_read(path))
+    return _index
+
+
+def lookup(company: str, country: str = "") -> Optional[Dict[str, Any]]:
+    """Listing data for `company` if the index knows it: symbol, exchange, name, match_score."""
+    if not ENABLED:
+        return None
+    found = get_index().match(company, country)
+    if found is None:
+        return None
+    listing, score = found
+    return {"ticker": listing.symbol, "exchange": listing.exchange, "name": listing.name, "match_score": score}
+
+
+def refresh(path: str = REFRESHED_PATH) -> int:
+    """Rebuild the index file from the SEC listing and reload it; returns the number of listings.
+
+    The bundled file's aliases and non-US listings are kept. The SEC asks for a
+    descriptive User-Agent with contact details (SEC_USER_AGENT).
+    """
+    global _index
+    agent = os.environ.get("SEC_USER_AGENT", "company-research-agent admin@example.com")
+    resp = get_client().get(SEC_URL, headers={"User-Agent": agent}, timeout=30)
+    resp.raise_for_status()
+    payload = resp.json()
+    columns = payload["fields"]
+    bundled = {row["symbol"]: row for row in _read(BUNDLED_PATH)}
+    rows: Dict[str, Dict[str, str]] = {}
+    for values in payload["data"]:
+        rec = dict(zip(columns, values))
+        symbol = str(rec.get("ticker") or "").upper()
+        if not symbol or symbol in rows:
+            continue
+        rows[symbol] = {
+            "symbol": symbol,
+            "exchange": str(rec.get("exchange") or ""),
+            "name": str(rec.get("name") or ""),
+            "aliases": bundled.get(symbol, {}).get("aliases", ""),
+            "country": bundled.get(symbol, {}).get("country", "us"),
+        }
+    for symbol, row in bundled.items():
+        rows.setdefault(symbol, row)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows.values())
+    os.replace(tmp, path)
+    with _lock:
+        _index = TickerIndex(list(rows.values()))
+    return len(rows)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["refresh"]:
+        print(json.dumps({"listings": refresh(), "path": REFRESHED_PATH}))
+    else:
+        print("usage: python -m tools.ticker_index refresh", file=sys.stderr)
+        sys.exit(2)
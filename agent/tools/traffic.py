@@ -1,8 +1,16 @@
 from typing import Any, Dict, List
 
-from .search import web_search, fetch_url
+from . import compact, hedge
+from .metrics import instrument
+from .search import fetch_many, result_hrefs, web_search_many
+from .signals import traffic_snippets
+from .urls import dedupe_urls
 
+# Terms that make a traffic snippet worth keeping
+_TRAFFIC_TERMS = ("monthly visits", "visits", "unique visitors", "traffic", "rank", "bounce", "%", "million")
 
+
+@instrument
 def get_web_traffic_summary(company: str, website: str = "") -> Dict[str, Any]:
     """Best-effort web traffic summary using public mentions (Similarweb, press, blog posts).
 
@@ -20,24 +28,20 @@ def get_web_traffic_summary(company: str, website: str = "") -> Dict[str, Any]:
     sources: List[str] = []
     trend_snippets: List[str] = []
 
-    for q in queries:
-        res = web_search(q, max_results=5)
-        if res.get("status") != "success":
-            continue
-        for r in res.get("data", []):
-            href = r.get("href")
-            if href:
-                sources.append(href)
-                page = fetch_url(href)
-                if page.get("status") == "success":
-                    content = page.get("data", {}).get("content", "")
-                    # Extract small snippet windows mentioning visits/traffic
-                    lower = content.lower()
-                    for kw in ["visits", "monthly visits", "traffic", "unique visitors"]:
-                        idx = lower.find(kw)
-                        if idx != -1:
-                            snippet = content[max(0, idx - 120) : idx + 180]
-                            trend_snippets.append(snippet.strip())
+    # Search and fetch concurrently, then scan pages in query/result order
+    # (extra results per search stand in for pages that are slow to load)
+    results = web_search_many(queries, max_results=5 + hedge.ALTERNATES)
+    hrefs, alternates = result_hrefs(results, 5)
+    hrefs = dedupe_urls(hrefs)
+    pages = fetch_many(hrefs, alternates=alternates)
+
+    for href, page in pages.items():
+        # Only pages that were read count as sources (not ones that lost a hedge)
+        if page.get("status") == "success":
+            sources.append(href)
+            content = page.get("data", {}).get("content", "")
+            # Extract small snippet windows mentioning visits/traffic
+            trend_snippets.extend(traffic_snippets(content))
 
     summary = "Public sources indicate recent traffic signals; figures are approximate and may be outdated."
     return {
@@ -45,7 +49,7 @@ def get_web_traffic_summary(company: str, website: str = "") -> Dict[str, Any]:
         "data": {
             "web_traffic": {
                 "summary": summary,
-                "trend_snippets": trend_snippets[:10],
+                "trend_snippets": compact.compact_texts(trend_snippets, compact.budget("traffic"), _TRAFFIC_TERMS)[:10],
                 "sources": list(dict.fromkeys(sources)),
             }
         },
@@ -0,0 +1,80 @@
+import re
+from typing import Iterable, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query params that only track the click, never change the document
+_TRACKING_PARAMS = frozenset(
+    [
+        "gclid", "gclsrc", "dclid", "fbclid", "msclkid", "yclid", "twclid", "igshid", "mc_cid", "mc_eid",
+        "_ga", "_gl", "_hsenc", "_hsmi", "mkt_tok", "oly_anon_id", "oly_enc_id", "vero_id", "wickedid",
+        "ref_src", "ref_url", "cmpid", "ncid", "sr_share", "smid", "spm", "outputtype", "amp_js_v", "usqp",
+    ]
+)
+# Bare `ref` and `at_*` are left alone: GitHub/GitLab refs and many APIs use them
+_TRACKING_PREFIXES = ("utm_", "pk_", "hsa_", "itm_")
+# Mobile/AMP host prefixes: m.example.com, en.m.wikipedia.org, amp.example.com
+_MOBILE_HOST_RE = re.compile(r"(^|\.)(m|mobile|amp)\.(?=[^.]+\.[^.]+)")
+# AMP path suffixes: /story/amp, /story/amp/, /story.amp, /story.amp.html. An /amp
+# segment elsewhere in the path (/products/amp/specs), or a bare /amp with no
+# parent page, names a different page.
+_AMP_PATH_RE = re.compile(r"(?<=[^/])/amp/?$|\.amp(?=\.html?$|$)")
+
+
+def _is_tracking(name: str, value: str) -> bool:
+    name = name.lower()
+    if name == "amp":
+        # ?amp / ?amp=1 asks for the AMP rendering of the same page
+        return value in ("", "1", "true")
+    return name in _TRACKING_PARAMS or name.startswith(_TRACKING_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """Normalize a URL so equivalent spellings map to one cache key.
+
+    Lowercases scheme/host, drops default ports, fragments and tracking params,
+    folds mobile/AMP variants onto the main page, sorts query params. The result
+    identifies a document; fetches still go to the URL as given.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme == "http":
+        # Same document over either scheme
+        scheme = "https"
+    host = _MOBILE_HOST_RE.sub(r"\1", (parts.hostname or "").lower())
+    if host.startswith("www."):
+        host = host[4:]
+    port = parts.port
+    netloc = host if port is None or _DEFAULT_PORTS.get(parts.scheme.lower()) == port else f"{host}:{port}"
+    path = _AMP_PATH_RE.sub("", parts.path) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    query = urlencode(sorted((k, v) for k, v in params if not _is_tracking(k, v)))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def url_key(url: str) -> str:
+    """canonical_url, or the URL as given when it cannot be parsed (bad port, broken IPv6 host)."""
+    try:
+        return canonical_url(url)
+    except ValueError:
+        return url
+
+
+def dedupe_urls(urls: Iterable[str]) -> List[str]:
+    """First spelling of each distinct document, in order (empty entries dropped).
+
+    Unparseable URLs are kept and only match themselves (see url_key).
+    """
+    seen = set()
+    unique: List[str] = []
+    for url in urls:
+        if not url:
+            continue
+        key = url_key(url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
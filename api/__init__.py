@@ -0,0 +1,11 @@
+"""HTTP extensions mounted on the ADK FastAPI app in server.py."""
+
+import os
+import sys
+
+# The agent code imports its tools as top-level `tools.*` (ADK puts the agents
+# directory on sys.path when it loads an agent); mirror that so the server-side
+# modules share the same tool modules and their process-wide caches.
+AGENTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "agent")
+if AGENTS_DIR not in sys.path:
+    sys.path.append(AGENTS_DIR)
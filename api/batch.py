@@ -0,0 +1,88 @@
+"""Batch research endpoint streaming one NDJSON line per finished report."""
+
+import asyncio
+import json
+import os
+import uuid
+from typing import AsyncIterator, Dict, List, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from tools import deadline
+from tools.context import ResearchContext, use_context
+
+from .reports import run_report
+
+# Reports running at once across all batches in this process. Upstream
+# per-domain limits are set separately via HTTP_DOMAIN_LIMITS.
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+MAX_BATCH_ITEMS = int(os.environ.get("BATCH_MAX_ITEMS", "1000"))
+# Searches and pages a batch keeps in memory for its reports to share (LRU);
+# evicted pages are still served by the on-disk page cache
+BATCH_CONTEXT_MAX_ENTRIES = int(os.environ.get("BATCH_CONTEXT_MAX_ENTRIES", "1024"))
+
+_scheduler = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+router = APIRouter()
+
+
+class BatchItem(BaseModel):
+    company: str
+    country: str = ""
+
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem] = Field(..., max_length=MAX_BATCH_ITEMS)
+    # Ignore cached reports and research every company again
+    force_refresh: bool = False
+
+
+def _run_in_context(shared: ResearchContext, company: str, country: str, force_refresh: bool) -> Dict:
+    # Every report in the batch memoizes into the same context, so searches and
+    # pages that overlap between companies are fetched once. Each report still
+    # gets its own deadline.
+    use_context(shared)
+    deadline.start()
+    return run_report(company, country, force_refresh)
+
+
+async def _research(shared: ResearchContext, company: str, country: str, force_refresh: bool) -> Dict:
+    async with _scheduler:
+        try:
+            report = await asyncio.to_thread(_run_in_context, shared, company, country, force_refresh)
+            return {"status": "success", "report": report}
+        except Exception as e:  # noqa: BLE001
+            return {"status": "error", "error_message": f"Research failed for {company}: {e}"}
+
+
+async def _stream(items: List[BatchItem], force_refresh: bool) -> AsyncIterator[str]:
+    shared = ResearchContext(f"batch:{uuid.uuid4().hex}", pinned=True, max_entries=BATCH_CONTEXT_MAX_ENTRIES)
+    # Identical (company, country) pairs are researched once and reported per index
+    indexes: Dict[Tuple[str, str], List[int]] = {}
+    for i, item in enumerate(items):
+        key = (" ".join(item.company.split()).lower(), item.country.strip().lower())
+        indexes.setdefault(key, []).append(i)
+
+    async def run(key: Tuple[str, str]) -> Tuple[Tuple[str, str], Dict]:
+        first = items[indexes[key][0]]
+        return key, await _research(shared, first.company, first.country, force_refresh)
+
+    tasks = [asyncio.create_task(run(key)) for key in indexes]
+    try:
+        for done in asyncio.as_completed(tasks):
+            key, result = await done
+            for i in indexes[key]:
+                line = {"index": i, "company": items[i].company, "country": items[i].country, **result}
+                yield json.dumps(line) + "\n"
+    finally:
+        # Client went away: stop reports that have not started yet
+        for task in tasks:
+            task.cancel()
+
+
+@router.post("/batch_research")
+async def batch_research(req: BatchRequest) -> StreamingResponse:
+    """Research many companies; each report is streamed as an NDJSON line when it completes."""
+    return StreamingResponse(_stream(req.items, req.force_refresh), media_type="application/x-ndjson")
@@ -0,0 +1,76 @@
+"""Run the research agent programmatically and return its JSON report."""
+
+import asyncio
+import json
+import threading
+import uuid
+from typing import Any, Dict, Optional
+
+from agent.agent import root_agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from tools import report_cache
+
+APP_NAME = "agent"
+USER_ID = "api"
+
+_runner: Optional[Runner] = None
+_runner_lock = threading.Lock()
+
+
+def _get_runner() -> Runner:
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                _runner = Runner(app_name=APP_NAME, agent=root_agent, session_service=InMemorySessionService())
+    return _runner
+
+
+def company_message(company: str, country: str = "") -> str:
+    """User message in the format the agent expects (see README "Input and output")."""
+    return f"{company}, country: {country}" if country else company
+
+
+def parse_report(text: str) -> Dict[str, Any]:
+    """Parse the agent's final answer, tolerating Markdown fences around the JSON."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("agent response contains no JSON object")
+    return json.loads(text[start : end + 1])
+
+
+async def run_report_async(company: str, country: str = "", force_refresh: bool = False) -> Dict[str, Any]:
+    """Run one agent invocation in a throwaway session and return the parsed report.
+
+    `force_refresh` bypasses the report cache (the new report is still stored).
+    """
+    runner = _get_runner()
+    session_id = uuid.uuid4().hex
+    state = {report_cache.FORCE_REFRESH_KEY: True} if force_refresh else None
+    await runner.session_service.create_session(
+        app_name=APP_NAME, user_id=USER_ID, session_id=session_id, state=state
+    )
+    try:
+        message = types.Content(role="user", parts=[types.Part(text=company_message(company, country))])
+        final_text = ""
+        async for event in runner.run_async(user_id=USER_ID, session_id=session_id, new_message=message):
+            if event.is_final_response() and event.content and event.content.parts:
+                final_text = "".join(p.text or "" for p in event.content.parts)
+        return parse_report(final_text)
+    finally:
+        await runner.session_service.delete_session(app_name=APP_NAME, user_id=USER_ID, session_id=session_id)
+
+
+def run_report(company: str, country: str = "", force_refresh: bool = False) -> Dict[str, Any]:
+    """Blocking variant for worker threads.
+
+    Tools are synchronous and run on the event loop that drives the agent, so
+    each report gets its own thread and loop to keep reports from serializing.
+    """
+    return asyncio.run(run_report_async(company, country, force_refresh))
+
+
+# Stale cached reports are regenerated in the background through this process's runner
+report_cache.set_refresher(lambda company, country: run_report(company, country, force_refresh=True))
@@ -0,0 +1,272 @@
+"""SQLite-backed ADK session service: persistent, bounded and compressed.
+
+The ADK default (InMemorySessionService) keeps every session and its full event
+history, including large tool outputs, in RAM for the life of the process. This
+service keeps them in a local SQLite database instead:
+
+- events are stored as zlib-compressed JSON, so tool payloads take a fraction
+  of their size and nothing stays resident between requests
+- each session keeps only its newest SESSION_MAX_EVENTS events
+- sessions idle for SESSION_IDLE_TTL seconds are deleted (checked at most once
+  a minute, when sessions are created)
+
+Sessions survive restarts and are shared by all server workers (WAL mode).
+server.py installs it when SESSION_DB is set and checks that the app uses it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session, State
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+SESSION_IDLE_TTL = float(os.environ.get("SESSION_IDLE_TTL", str(24 * 3600)))
+SESSION_MAX_EVENTS = int(os.environ.get("SESSION_MAX_EVENTS", "200"))
+_EVICT_INTERVAL = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE INDEX IF NOT EXISTS sessions_last_update ON sessions (last_update_time);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_session ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_state (app_name TEXT PRIMARY KEY, state TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS user_state (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+
+def _session_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Keys stored on the session itself (app:/user: live in their own tables, temp: is never stored)."""
+    prefixes = (State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX)
+    return {k: v for k, v in state.items() if not k.startswith(prefixes)}
+
+
+class SqliteSessionService(BaseSessionService):
+    """Session service storing sessions and compressed events in one SQLite file."""
+
+    def __init__(self, path: str, idle_ttl: float = SESSION_IDLE_TTL, max_events: int = SESSION_MAX_EVENTS):
+        self.path = path
+        self.idle_ttl = idle_ttl
+        self.max_events = max_events
+        self._local = threading.local()
+        self._last_evict = 0.0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+        return conn
+
+    # --- shared app/user state -------------------------------------------------
+
+    def _merge_state(self, session: Session) -> Session:
+        conn = self._conn()
+        row = conn.execute("SELECT state FROM app_state WHERE app_name = ?", (session.app_name,)).fetchone()
+        for key, value in json.loads(row[0] if row else "{}").items():
+            session.state[State.APP_PREFIX + key] = value
+        row = conn.execute(
+            "SELECT state FROM user_state WHERE app_name = ? AND user_id = ?", (session.app_name, session.user_id)
+        ).fetchone()
+        for key, value in json.loads(row[0] if row else "{}").items():
+            session.state[State.USER_PREFIX + key] = value
+        return session
+
+    def _update_shared_state(
+        self, conn: sqlite3.Connection, app_name: str, user_id: str, delta: Dict[str, Any]
+    ) -> None:
+        app = {k[len(State.APP_PREFIX):]: v for k, v in delta.items() if k.startswith(State.APP_PREFIX)}
+        user = {k[len(State.USER_PREFIX):]: v for k, v in delta.items() if k.startswith(State.USER_PREFIX)}
+        if app:
+            row = conn.execute("SELECT state FROM app_state WHERE app_name = ?", (app_name,)).fetchone()
+            merged = {**json.loads(row[0] if row else "{}"), **app}
+            conn.execute("INSERT OR REPLACE INTO app_state VALUES (?, ?)", (app_name, json.dumps(merged)))
+        if user:
+            row = conn.execute(
+                "SELECT state FROM user_state WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+            ).fetchone()
+            merged = {**json.loads(row[0] if row else "{}"), **user}
+            conn.execute(
+                "INSERT OR REPLACE INTO user_state VALUES (?, ?, ?)", (app_name, user_id, json.dumps(merged))
+            )
+
+    # --- sessions --------------------------------------------------------------
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        self.evict_idle()
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        session = Session(
+            app_name=app_name, user_id=user_id, id=session_id, state=state or {}, last_update_time=time.time()
+        )
+        conn = self._conn()
+        with conn:
+            # Initial app:/user: keys are shared state, as with the in-memory service's deltas
+            self._update_shared_state(conn, app_name, user_id, session.state)
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                (app_name, user_id, session_id, json.dumps(_session_state(session.state)), session.last_update_time),
+            )
+        return self._merge_state(session)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT state, last_update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+            (app_name, user_id, session_id),
+        ).fetchone()
+        if row is None:
+            return None
+        query = "SELECT payload FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+        params: List[Any] = [app_name, user_id, session_id]
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        query += " ORDER BY seq DESC"
+        if config and config.num_recent_events:
+            query += " LIMIT ?"
+            params.append(config.num_recent_events)
+        payloads = [r[0] for r in conn.execute(query, params).fetchall()]
+        events = [Event.model_validate_json(zlib.decompress(p)) for p in reversed(payloads)]
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=json.loads(row[0]),
+            events=events,
+            last_update_time=row[1],
+        )
+        return self._merge_state(session)
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        rows = self._conn().execute(
+            "SELECT id, state, last_update_time FROM sessions WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+        ).fetchall()
+        sessions = [
+            self._merge_state(
+                Session(app_name=app_name, user_id=user_id, id=sid, state=json.loads(state), last_update_time=updated)
+            )
+            for sid, state, updated in rows
+        ]
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?", (app_name, user_id, session_id)
+            )
+            conn.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", (app_name, user_id, session_id))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        # Updates the caller's session object (state and events)
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        key = (session.app_name, session.user_id, session.id)
+        conn = self._conn()
+        with conn:
+            if event.actions and event.actions.state_delta:
+                self._update_shared_state(conn, session.app_name, session.user_id, event.actions.state_delta)
+            updated = conn.execute(
+                "UPDATE sessions SET state = ?, last_update_time = ? WHERE app_name = ? AND user_id = ? AND id = ?",
+                (json.dumps(_session_state(session.state)), event.timestamp, *key),
+            )
+            if not updated.rowcount:
+                # Deleted or evicted meanwhile; nothing to append to
+                return event
+            payload = zlib.compress(event.model_dump_json(exclude_none=True).encode())
+            conn.execute(
+                "INSERT INTO events (app_name, user_id, session_id, timestamp, payload) VALUES (?, ?, ?, ?, ?)",
+                (*key, event.timestamp, payload),
+            )
+            if self.max_events > 0:
+                # Keep the newest max_events events of this session
+                conn.execute(
+                    "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? AND seq <= ("
+                    " SELECT seq FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+                    " ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+                    (*key, *key, self.max_events),
+                )
+        return event
+
+    # --- bounds ----------------------------------------------------------------
+
+    def evict_idle(self, force: bool = False) -> int:
+        """Delete sessions idle for longer than idle_ttl; returns how many were removed."""
+        now = time.time()
+        if self.idle_ttl <= 0 or (not force and now - self._last_evict < _EVICT_INTERVAL):
+            return 0
+        self._last_evict = now
+        cutoff = now - self.idle_ttl
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "DELETE FROM events WHERE (app_name, user_id, session_id) IN ("
+                " SELECT app_name, user_id, id FROM sessions WHERE last_update_time < ?)",
+                (cutoff,),
+            )
+            removed = conn.execute("DELETE FROM sessions WHERE last_update_time < ?", (cutoff,)).rowcount
+        return removed
+
+
+def session_services_of(app: Any) -> List[BaseSessionService]:
+    """Session services the ADK route handlers of `app` actually use.
+
+    get_fast_api_app has no hook for a custom service; its handlers close over
+    the ADK web server object that holds it, which is how this finds them.
+    """
+    found: List[BaseSessionService] = []
+    for route in app.routes:
+        for cell in getattr(getattr(route, "endpoint", None), "__closure__", None) or ():
+            try:
+                value = cell.cell_contents
+            except ValueError:  # empty cell
+                continue
+            service = getattr(value, "session_service", value)
+            if isinstance(service, BaseSessionService) and all(service is not s for s in found):
+                found.append(service)
+    return found
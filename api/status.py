@@ -0,0 +1,36 @@
+"""Operational endpoints: Prometheus metrics and upstream limiter/breaker state.
+
+Metrics and limiter/breaker state live in each server worker process. With
+WORKERS > 1 a request reaches one worker: its pid is in the `worker` metric
+label and the X-Worker-Pid header. Resets are applied by every worker.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, Response
+from fastapi.responses import PlainTextResponse
+
+from tools import metrics, resilience
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics() -> PlainTextResponse:
+    """Tool latency/outcomes, fetch bytes, pages parsed, cache and upstream stats (this worker)."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get("/upstreams")
+def upstreams(response: Response) -> Dict[str, Dict[str, Any]]:
+    """Rate limiter, retry budget and breaker state per upstream (DDG search/news, fetched domains), this worker."""
+    response.headers["X-Worker-Pid"] = str(os.getpid())
+    return resilience.snapshot()
+
+
+@router.post("/upstreams/reset")
+def reset_upstreams(name: Optional[str] = None) -> Dict[str, str]:
+    """Forget the state of one upstream (`?name=fetch:example.com`) or of all of them, in every worker."""
+    resilience.reset(name)
+    return {"status": "success"}
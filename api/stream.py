@@ -0,0 +1,107 @@
+"""Section-by-section report streaming over Server-Sent Events.
+
+GET /research_stream?company=...&country=... emits one `section` event per
+report section as soon as the tools behind it finish, then a `report` event
+with every section merged into the report schema:
+
+    event: section
+    data: {"section": "news", "status": "success", "data": {...}}
+
+    event: report
+    data: {"status": "success", "report": {...}, "synthesized": false}
+
+Sections of a fresh cached report are sent straight away; only stale or
+missing ones are researched. With synthesize=true the final report is written
+by the agent (one model turn over the same, already memoized research).
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from tools import deadline, report_cache
+from tools.context import ResearchContext, use_context
+from tools.sections import SECTIONS, section_jobs
+
+from .reports import run_report
+
+router = APIRouter()
+
+
+def _event(name: str, payload: Dict[str, Any]) -> str:
+    return f"event: {name}\ndata: {json.dumps(payload)}\n\n"
+
+
+def _run_in_context(shared: ResearchContext, at: Optional[float], job: Callable[[], Any]) -> Any:
+    use_context(shared)
+    deadline.bind(at)
+    return job()
+
+
+async def _stream(company: str, country: str, force_refresh: bool, synthesize: bool) -> AsyncIterator[str]:
+    report: Dict[str, Any] = {}
+    pending = list(SECTIONS)
+    cached = None if force_refresh else report_cache.lookup(company, country)
+    if cached and isinstance(cached["report"], dict):
+        stale = set(cached["stale_sections"])
+        for section in SECTIONS:
+            if section in cached["report"] and section not in stale:
+                report[section] = cached["report"][section]
+                pending.remove(section)
+                payload = {"section": section, "status": "success", "data": report[section], "cached": True}
+                yield _event("section", payload)
+
+    # One context for the whole stream: sections share searches and pages, and
+    # the synthesis turn reuses all of it
+    shared = ResearchContext(f"stream:{uuid.uuid4().hex}", pinned=True)
+    # Sections share one report deadline; late sections come back partial
+    at = deadline.start()
+    jobs = section_jobs(company, country)
+
+    async def run(section: str) -> Dict[str, Any]:
+        try:
+            data = await asyncio.to_thread(_run_in_context, shared, at, jobs[section])
+            return {"section": section, "status": "success", "data": data}
+        except Exception as e:  # noqa: BLE001
+            return {"section": section, "status": "error", "error_message": f"{section} failed: {e}"}
+
+    tasks = [asyncio.create_task(run(section)) for section in pending]
+    try:
+        for done in asyncio.as_completed(tasks):
+            result = await done
+            report[result["section"]] = result.get("data")
+            yield _event("section", result)
+    finally:
+        # Client went away: stop sections that have not started yet
+        for task in tasks:
+            task.cancel()
+
+    merged = {section: report.get(section) for section in SECTIONS}
+    if not synthesize:
+        yield _event("report", {"status": "success", "report": merged, "synthesized": False})
+        return
+    try:
+        final = await asyncio.to_thread(_run_in_context, shared, at, lambda: run_report(company, country, force_refresh))
+        yield _event("report", {"status": "success", "report": final, "synthesized": True})
+    except Exception as e:  # noqa: BLE001
+        # The merged sections are still a complete (if unpolished) report
+        yield _event(
+            "report",
+            {"status": "error", "error_message": f"Synthesis failed: {e}", "report": merged, "synthesized": False},
+        )
+
+
+@router.get("/research_stream")
+async def research_stream(
+    company: str, country: str = "", force_refresh: bool = False, synthesize: bool = False
+) -> StreamingResponse:
+    """Stream report sections as Server-Sent Events as they become ready, then the merged report."""
+    return StreamingResponse(
+        _stream(company, country, force_refresh, synthesize),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
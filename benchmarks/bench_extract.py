@@ -0,0 +1,110 @@
+"""Benchmark the HTML-to-text extractor backends over a corpus of saved pages.
+
+Reports pages/sec and peak memory per backend, plus whether each backend's
+output matches the BeautifulSoup reference. Each backend runs in a fresh
+subprocess so peak RSS is not polluted by the others.
+
+    python benchmarks/bench_extract.py [--corpus DIR] [--repeat N] [--scale N] [--json]
+"""
+
+import argparse
+import glob
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "agent"))
+
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus", "pages")
+
+
+def load_corpus(corpus: str, scale: int) -> list:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus, "*.htm*"))):
+        with open(path, "rb") as f:
+            data = f.read()
+        if scale > 1:
+            # Inflate the body to emulate large real-world pages
+            start = data.find(b">", data.find(b"<body")) + 1
+            end = data.rfind(b"</body>")
+            if 0 < start < end:
+                data = data[:start] + data[start:end] * scale + data[end:]
+        pages.append(data)
+    return pages
+
+
+def run_backend(backend: str, corpus: str, repeat: int, scale: int, max_chars: int) -> dict:
+    from tools.extract import extract_html
+
+    pages = load_corpus(corpus, scale)
+    reference = [extract_html(p, max_chars, backend="bs4") for p in pages]
+    outputs = [extract_html(p, max_chars, backend=backend) for p in pages]
+    mismatches = sum(1 for a, b in zip(outputs, reference) if a[:2] != b[:2])
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            extract_html(page, max_chars, backend=backend)
+    elapsed = time.perf_counter() - started
+    _, peak_py = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    parsed = repeat * len(pages)
+    return {
+        "backend": backend,
+        "pages": parsed,
+        "bytes_per_page": sum(map(len, pages)) // max(1, len(pages)),
+        "seconds": round(elapsed, 4),
+        "pages_per_sec": round(parsed / elapsed, 1) if elapsed else None,
+        "peak_python_kib": peak_py // 1024,
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == "darwin" else 1),
+        "mismatches_vs_bs4": mismatches,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=50, help="passes over the corpus per backend")
+    parser.add_argument("--scale", type=int, default=1, help="repeat each page body N times")
+    parser.add_argument("--max-chars", type=int, default=1_000_000, help="max_chars passed to the extractor")
+    parser.add_argument("--backend", action="append", help="backend(s) to run (default: all available)")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, args.corpus, args.repeat, args.scale, args.max_chars)))
+        return
+
+    from tools.extract import available_backends
+
+    results = []
+    for backend in args.backend or available_backends():
+        cmd = [
+            sys.executable, os.path.abspath(__file__), "--worker", backend, "--corpus", args.corpus,
+            "--repeat", str(args.repeat), "--scale", str(args.scale), "--max-chars", str(args.max_chars),
+        ]
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'backend':<12}{'pages/s':>10}{'peak rss KiB':>14}{'peak py KiB':>13}{'mismatch':>10}")
+    for r in results:
+        print(
+            f"{r['backend']:<12}{r['pages_per_sec']:>10}{r['peak_rss_kib']:>14}"
+            f"{r['peak_python_kib']:>13}{r['mismatches_vs_bs4']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""Benchmark the research tools offline against local stand-ins.
+
+Searches are answered by a fake DDGS client from recorded results and pages by
+a local replay proxy (see standins.py), so runs need no network and are
+reproducible. For each tool, and for the whole prefetch pipeline end to end,
+it reports wall time, searches, HTTP requests, bytes and peak RSS. With
+--json/--output the results can be diffed between commits, and --baseline
+prints the change against a previous JSON result.
+
+    python benchmarks/bench_tools.py [--repeat N] [--latency-ms MS] [--fail-rate F] [--json] [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "agent"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from standins import DEFAULT_CORPUS, FakeDDGS, load_replay  # noqa: E402
+
+
+def _peak_rss_kib() -> int:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // (1024 if sys.platform == "darwin" else 1)
+
+
+def _configure_env(proxy: str, cache_dir: str) -> None:
+    """Settings read by the tool modules at import time; must run before importing them."""
+    os.environ.update(
+        {
+            "HTTP_PROXY": proxy,
+            "http_proxy": proxy,
+            "RESEARCH_CACHE_DIR": cache_dir,
+            # Measure the work itself, not cache hits or pacing
+            "PAGE_CACHE": "0",
+            "SEARCH_CACHE": "0",
+            "REPORT_CACHE": "0",
+            "ENTITY_STORE": "0",
+            "MARKET_CACHE": "0",
+            "SINGLE_FLIGHT_TTL": "0",
+            "SEARCH_RATE": "0",
+            "FETCH_RATE_PER_DOMAIN": "0",
+        }
+    )
+    for key in ("NO_PROXY", "no_proxy", "ALL_PROXY", "all_proxy"):
+        os.environ.pop(key, None)
+
+
+def _jobs(company: str, country: str, corpus: Dict[str, Any]) -> Dict[str, Callable[[], Any]]:
+    from tools.financials import detect_ticker
+    from tools.funding import get_company_funding_summary
+    from tools.prefetch import prefetch_research
+    from tools.profiles import get_company_competitors, get_company_leadership, get_company_overview
+    from tools.search import fetch_url, news_search, web_search
+    from tools.traffic import get_web_traffic_summary
+
+    first_page = next(iter(corpus["pages"]))
+    website = next((u for u in corpus["pages"] if u.count("/") == 3), "")
+    return {
+        "web_search": lambda: web_search(f"{company} competitors {country}".strip(), max_results=10),
+        "news_search": lambda: news_search(company, max_results=10),
+        "fetch_url": lambda: fetch_url(first_page),
+        "detect_ticker": lambda: detect_ticker(company, country),
+        "get_company_overview": lambda: get_company_overview(company, country),
+        "get_company_leadership": lambda: get_company_leadership(company, country),
+        "get_company_competitors": lambda: get_company_competitors(company, country),
+        "get_company_funding_summary": lambda: get_company_funding_summary(company, country),
+        "get_web_traffic_summary": lambda: get_web_traffic_summary(company, website),
+        # Every tool concurrently, as in RESEARCH_PIPELINE mode (without the LLM turn)
+        "end_to_end": lambda: prefetch_research(company, country),
+    }
+
+
+def _errors(result: Any) -> int:
+    if isinstance(result, dict) and result.get("status") in ("success", "error"):
+        return int(result["status"] == "error")
+    if isinstance(result, dict):
+        return sum(_errors(v) for v in result.values())
+    return 0
+
+
+def _bytes_read() -> float:
+    from tools import metrics
+
+    with metrics._lock:
+        return sum(v for (name, _), v in metrics._counters.items() if name == "research_fetch_bytes_total")
+
+
+def run(args: argparse.Namespace, control: Any) -> Dict[str, Any]:
+    from tools import ddgs_pool
+    from tools.context import bind_context
+
+    corpus = load_replay(args.corpus)
+    company, country = corpus["company"], corpus["country"]
+    ddgs_pool.set_factory(lambda: FakeDDGS(corpus["searches"], args.search_latency_ms / 1000))
+    jobs = _jobs(company, country, corpus)
+
+    results: Dict[str, Any] = {}
+    for name, job in jobs.items():
+        if args.tool and name not in args.tool:
+            continue
+        walls: List[float] = []
+        for i in range(args.repeat + 1):
+            # A fresh research context per run: nothing memoized between runs
+            bind_context(uuid.uuid4().hex)
+            control("/__reset")
+            searches, bytes_read = FakeDDGS.calls, _bytes_read()
+            started = time.perf_counter()
+            out = job()
+            elapsed = time.perf_counter() - started
+            if i == 0:
+                continue  # warm-up: imports, pool start-up, first connections
+            walls.append(elapsed)
+            served = control("/__stats")
+            last = {
+                "searches": FakeDDGS.calls - searches,
+                "http_requests": served["requests"],
+                "http_failed": served["failed"] + served["stalled"],
+                "bytes_served": served["bytes"],
+                "bytes_read": int(_bytes_read() - bytes_read),
+                "errors": _errors(out),
+            }
+        results[name] = {
+            "wall_s_median": round(statistics.median(walls), 4),
+            "wall_s_min": round(min(walls), 4),
+            **last,
+            "peak_rss_kib": _peak_rss_kib(),
+        }
+    return {
+        "config": {
+            k: getattr(args, k)
+            for k in ("repeat", "latency_ms", "jitter_ms", "search_latency_ms", "fail_rate", "stall_rate", "page_scale", "seed")
+        },
+        "tools": results,
+        "unrecorded_queries": sorted(set(FakeDDGS.unrecorded)),
+        "peak_rss_kib": _peak_rss_kib(),
+    }
+
+
+def _print_table(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    base = baseline.get("tools", {})
+    print(f"{'tool':<30}{'median s':>10}{'min s':>9}{'searches':>10}{'http':>6}{'KiB read':>10}{'errors':>8}{'vs base':>9}")
+    for name, r in report["tools"].items():
+        delta = ""
+        if name in base and base[name]["wall_s_median"]:
+            delta = f"{(r['wall_s_median'] / base[name]['wall_s_median'] - 1) * 100:+.0f}%"
+        print(
+            f"{name:<30}{r['wall_s_median']:>10}{r['wall_s_min']:>9}{r['searches']:>10}{r['http_requests']:>6}"
+            f"{r['bytes_read'] // 1024:>10}{r['errors']:>8}{delta:>9}"
+        )
+    print(f"peak RSS {report['peak_rss_kib']} KiB")
+    if report["unrecorded_queries"]:
+        print("queries missing from the recording (corpus/replay.json):")
+        for q in report["unrecorded_queries"]:
+            print(f"  {q}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="directory with replay.json and pages/")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per tool (after one warm-up)")
+    parser.add_argument("--latency-ms", type=float, default=20, help="replay server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=5)
+    parser.add_argument("--search-latency-ms", type=float, default=30, help="fake DDGS latency per search")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of page requests answered 503")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="fraction of page requests stalled")
+    parser.add_argument("--stall-ms", type=float, default=5000)
+    parser.add_argument("--page-scale", type=int, default=1, help="repeat each page body N times")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tool", action="append", help="tool(s) to run (default: all, then end_to_end)")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    parser.add_argument("--output", help="also write the JSON result to this file")
+    parser.add_argument("--baseline", help="previous JSON result to compare wall times against")
+    args = parser.parse_args()
+
+    server_cmd = [
+        sys.executable, os.path.join(ROOT, "benchmarks", "standins.py"), "--corpus", args.corpus,
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--fail-rate", str(args.fail_rate), "--stall-rate", str(args.stall_rate), "--stall-ms", str(args.stall_ms),
+        "--page-scale", str(args.page_scale), "--seed", str(args.seed),
+    ]
+    server = subprocess.Popen(server_cmd, stdout=subprocess.PIPE, text=True)
+    try:
+        port = int(server.stdout.readline())
+        with tempfile.TemporaryDirectory() as cache_dir:
+            _configure_env(f"http://127.0.0.1:{port}", cache_dir)
+            import httpx
+
+            direct = httpx.Client(base_url=f"http://127.0.0.1:{port}", trust_env=False)
+            report = run(args, lambda path: direct.get(path).json())
+    finally:
+        server.terminate()
+        server.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    baseline: Dict[str, Any] = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    _print_table(report, baseline)
+
+
+if __name__ == "__main__":
+    main()
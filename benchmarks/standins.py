@@ -0,0 +1,196 @@
+"""Local stand-ins for the upstreams the tools talk to, for offline benchmarks.
+
+- FakeDDGS: drop-in for duckduckgo_search.DDGS that serves recorded results
+  from corpus/replay.json (install it with tools.ddgs_pool.set_factory).
+- The replay server: an HTTP proxy that answers absolute-form requests
+  (`GET http://host/path`) from the recorded pages, with injected latency,
+  failures (503) and stalls. Point the shared httpx client at it with
+  HTTP_PROXY; control endpoints /__stats and /__reset are served directly.
+
+    python benchmarks/standins.py [--port 0] [--latency-ms 20] [--fail-rate 0.05] ...
+
+prints the bound port on its first stdout line.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CORPUS = os.path.join(ROOT, "benchmarks", "corpus")
+
+
+def load_replay(corpus: str) -> Dict[str, Any]:
+    with open(os.path.join(corpus, "replay.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _normalize_query(query: str) -> str:
+    # Same normalization as tools.search_cache.normalize_query
+    return " ".join(query.split()).lower()
+
+
+class FakeDDGS:
+    """Serves recorded `text`/`news` results; unknown queries return nothing and are logged."""
+
+    # Shared across instances: the pool builds several
+    calls = 0
+    unrecorded: List[str] = []
+    _lock = threading.Lock()
+
+    def __init__(self, searches: Dict[str, Dict[str, List[Dict[str, Any]]]], latency: float = 0.0):
+        self.searches = searches
+        self.latency = latency
+        self.sleep_timestamp = 0.0
+
+    def __enter__(self) -> "FakeDDGS":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+    def _serve(self, kind: str, query: str, max_results: Optional[int]) -> List[Dict[str, Any]]:
+        if self.latency:
+            time.sleep(self.latency)
+        results = self.searches.get(kind, {}).get(_normalize_query(query))
+        with FakeDDGS._lock:
+            FakeDDGS.calls += 1
+            if results is None:
+                FakeDDGS.unrecorded.append(f"{kind}: {query}")
+        return list(results or [])[: max_results or None]
+
+    def text(self, query: str, max_results: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self._serve("text", query, max_results)
+
+    def news(self, query: str, max_results: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+        return self._serve("news", query, max_results)
+
+
+def _inflate(data: bytes, scale: int) -> bytes:
+    """Repeat the page body `scale` times to emulate large real-world pages."""
+    if scale <= 1:
+        return data
+    start = data.find(b">", data.find(b"<body")) + 1
+    end = data.rfind(b"</body>")
+    if 0 < start < end:
+        return data[:start] + data[start:end] * scale + data[end:]
+    return data
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, corpus: str, args: argparse.Namespace):
+        super().__init__(("127.0.0.1", port), _ReplayHandler)
+        replay = load_replay(corpus)
+        self.pages: Dict[str, bytes] = {}
+        for url, name in replay["pages"].items():
+            with open(os.path.join(corpus, "pages", name), "rb") as f:
+                self.pages[url.rstrip("/")] = _inflate(f.read(), args.page_scale)
+        self.latency = args.latency_ms / 1000
+        self.jitter = args.jitter_ms / 1000
+        self.fail_rate = args.fail_rate
+        self.stall_rate = args.stall_rate
+        self.stall = args.stall_ms / 1000
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients hang up mid-body when they have read enough text
+        if not isinstance(sys.exc_info()[1], (ConnectionError, TimeoutError)):
+            super().handle_error(request, client_address)
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.stats = {"requests": 0, "bytes": 0, "ok": 0, "not_found": 0, "failed": 0, "stalled": 0}
+
+    def count(self, **deltas: int) -> None:
+        with self.lock:
+            for key, n in deltas.items():
+                self.stats[key] += n
+
+    def draw(self) -> tuple:
+        """(delay seconds, outcome) for one request, from the seeded RNG."""
+        with self.lock:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            roll = self.rng.random()
+        if roll < self.fail_rate:
+            return delay, "failed"
+        if roll < self.fail_rate + self.stall_rate:
+            return delay + self.stall, "stalled"
+        return delay, "ok"
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: ReplayServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "text/html; charset=utf-8") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if not re.match(r"^https?://", self.path):
+            return self._control()
+        self.server.count(requests=1)
+        delay, outcome = self.server.draw()
+        time.sleep(delay)
+        if outcome == "failed":
+            self.server.count(failed=1)
+            return self._send(503, b"injected failure", "text/plain")
+        if outcome == "stalled":
+            self.server.count(stalled=1)
+        body = self.server.pages.get(self.path.split("#")[0].rstrip("/"))
+        if body is None:
+            self.server.count(not_found=1)
+            return self._send(404, b"not in corpus", "text/plain")
+        self.server.count(ok=1, bytes=len(body))
+        self._send(200, body)
+
+    def _control(self) -> None:
+        if self.path == "/__reset":
+            self.server.reset_stats()
+        if self.path in ("/__stats", "/__reset"):
+            with self.server.lock:
+                body = json.dumps(self.server.stats).encode()
+            return self._send(200, body, "application/json")
+        self._send(404, b"", "text/plain")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--latency-ms", type=float, default=20, help="added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=5, help="+/- uniform jitter on the latency")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="fraction of requests delayed by --stall-ms")
+    parser.add_argument("--stall-ms", type=float, default=5000)
+    parser.add_argument("--page-scale", type=int, default=1, help="repeat each page body N times")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server = ReplayServer(args.port, args.corpus, args)
+    print(server.server_address[1], flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,14 @@
+import importlib
+import logging
 import os
+import time
 from typing import List
 
 import uvicorn
-from fastapi import FastAPI
-from google.adk.cli.fast_api import get_fast_api_app
+
+_IMPORT_STARTED = time.perf_counter()
+
+logger = logging.getLogger("uvicorn.error")
 
 
 def _parse_origins(value: str | None) -> List[str]:
@@ -22,17 +27,117 @@ ALLOWED_ORIGINS = _parse_origins(os.environ.get("ALLOWED_ORIGINS"))
 # Optionally serve the built-in ADK web UI
 SERVE_WEB_INTERFACE = os.environ.get("ADK_SERVE_WEB", "true").lower() in ("1", "true", "yes")
 
-# Build the FastAPI app with CORS configured
-app: FastAPI = get_fast_api_app(
-    agents_dir=AGENTS_DIR,
-    allow_origins=ALLOWED_ORIGINS,
-    web=SERVE_WEB_INTERFACE,
-)
+# Worker processes; each imports this module and builds its own app.
+# Caches shared between workers live in SQLite (RESEARCH_CACHE_DIR).
+WORKERS = int(os.environ.get("WORKERS", "1"))
+# Seconds a worker may take to answer the supervisor's health check; importing
+# ADK and pre-warming take longer than uvicorn's 5s default
+WORKER_HEALTHCHECK_TIMEOUT = int(os.environ.get("WORKER_HEALTHCHECK_TIMEOUT", "60"))
+
+# Heavy modules imported when a worker starts rather than on the first request
+# that needs them (get_public_financials imports yfinance lazily). Empty disables.
+PREWARM_MODULES = [m.strip() for m in os.environ.get("PREWARM_MODULES", "pandas,yfinance").split(",") if m.strip()]
+
+# Persistent, bounded session storage (SQLite file path); unset keeps ADK's in-memory sessions
+SESSION_DB = os.environ.get("SESSION_DB")
+
+
+def _process_age() -> float:
+    """Seconds since this process started (Linux), else since this module was imported.
+
+    Spawned workers import everything twice (once as __mp_main__), so time since
+    import alone would miss most of the cold start.
+    """
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (after the parenthesized command name): start time in clock ticks since boot
+            started = int(f.read().rsplit(")", 1)[1].split()[19]) / os.sysconf("SC_CLK_TCK")
+        with open("/proc/uptime") as f:
+            return float(f.read().split()[0]) - started
+    except (OSError, ValueError, IndexError):
+        return time.perf_counter() - _IMPORT_STARTED
+
+
+def _prewarm(modules: List[str]) -> None:
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("prewarm: could not import %s: %s", name, e)
+
+
+# Child processes of multiprocessing (uvicorn's spawned workers, the parse
+# pool) re-run this file as __mp_main__ before starting their own work. Only a
+# real import pays for loading ADK and builds the app.
+if __name__ != "__mp_main__":
+    from fastapi import FastAPI
+    from google.adk.cli import fast_api
+    from google.adk.cli.fast_api import get_fast_api_app
+
+    from api.batch import router as batch_router
+    from api.sessions import SqliteSessionService, session_services_of
+    from api.status import router as status_router
+    from api.stream import router as stream_router
+
+    _in_memory_sessions = fast_api.InMemorySessionService
+    if SESSION_DB:
+        # get_fast_api_app builds its session service itself and only takes a URI
+        # for ADK's own backends, so swap the in-memory class it instantiates
+        # for the duration of the call
+        fast_api.InMemorySessionService = lambda: SqliteSessionService(SESSION_DB)
+    try:
+        # Build the FastAPI app with CORS configured
+        app: FastAPI = get_fast_api_app(
+            agents_dir=AGENTS_DIR,
+            allow_origins=ALLOWED_ORIGINS,
+            web=SERVE_WEB_INTERFACE,
+        )
+    finally:
+        fast_api.InMemorySessionService = _in_memory_sessions
+
+    # The swap relies on how this ADK version builds the app; refuse to serve
+    # with in-memory sessions when persistent ones were asked for
+    if SESSION_DB:
+        _services = session_services_of(app)
+        if not _services or not all(isinstance(s, SqliteSessionService) for s in _services):
+            raise RuntimeError(
+                "SESSION_DB is set but the app does not use SqliteSessionService "
+                f"(found {[type(s).__name__ for s in _services]}); "
+                "google-adk changed how get_fast_api_app builds its session service"
+            )
+
+    # Bulk research: POST /batch_research streams NDJSON reports as they finish
+    app.include_router(batch_router)
+    # GET /metrics (Prometheus) and GET /upstreams (rate limiter and circuit breaker state)
+    app.include_router(status_router)
+    # GET /research_stream: report sections as Server-Sent Events as soon as each is ready
+    app.include_router(stream_router)
+
+
+if __name__ == "server":
+    # Serving process: uvicorn imports "server:app" in every worker
+    _prewarm_started = time.perf_counter()
+    _prewarm(PREWARM_MODULES)
+    logger.info(
+        "worker %d cold start %.2fs (prewarm %.2fs)",
+        os.getpid(),
+        _process_age(),
+        time.perf_counter() - _prewarm_started,
+    )
 
 
 if __name__ == "__main__":
     host = os.environ.get("HOST", "0.0.0.0")
     port = int(os.environ.get("PORT", "8080"))
-    uvicorn.run("server:app", host=host, port=port, reload=os.environ.get("RELOAD", "0") == "1")
+    reload = os.environ.get("RELOAD", "0") == "1"
+    # uvicorn ignores workers when reloading; development mode stays single-process
+    uvicorn.run(
+        "server:app",
+        host=host,
+        port=port,
+        reload=reload,
+        workers=1 if reload else WORKERS,
+        timeout_worker_healthcheck=WORKER_HEALTHCHECK_TIMEOUT,
+    )
 
 